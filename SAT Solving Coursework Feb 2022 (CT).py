@@ -1,525 +1,4398 @@
-# Copy of code written for SAT solving coursework in Computational Thinking Module at Durham University
-# Received 68/76 total marks (all lost on efficiency of unit_propagate, pure_literal_eliminate and dpll_sat_solve)
-
-import copy
-import re
-from collections import Counter
-from typing import List, Set, Iterator, Iterable, Dict, Union
-
-
-# import time
-# from tqdm import trange
-
-
-# === OWN HELPER FUNCTIONS ===
-def sort_literals(literal_iterable: Iterable[int]) -> List[int]:
-    """
-    Sorts the iterable of literals given by each literal's absolute value (i.e. ignoring negation).
-    This is most useful for readability and for ensuring consistent ordering in other functions.
-
-    e.g. ``sort_literals([3, -2, -1]) == [-1, -2, 3]``
-    """
-
-    return sorted(list(literal_iterable), key=lambda x: abs(x))
-
-
-def extract_variables(clause_set: List[List[int]], clean: bool = True) -> List[int]:
-    """
-    Extracts a sorted list of all unique variables from clause_set.
-
-    e.g. ``extract_variables([[-1], [-2, 1], [3]]) == [1, 2, 3]``
-
-    If clean is False, then the above would return ``[-1, -2, 1, 3]``.
-    In this case, negated values are treated as unique and the output is not sorted.
-    """
-
-    literals = [literal for clause in clause_set for literal in clause]  # flatten clause_set
-    if clean:
-        literals = set(map(abs, literals))  # remove duplicates and remove negations
-        literals = list(literals)  # sort_literals(literals)
-    else:
-        literals = set(literals)
-    return literals
-
-
-def max_occurrence_literal(clause_set: List[List[int]]) -> int:
-    """
-    Returns the literal most commonly occurring in clause_set
-    """
-    literals = [literal for clause in clause_set for literal in clause]  # flatten clause_set
-    return Counter(literals).most_common(1)[0][0]  # select the 1 most common literal
-
-
-# def moms(clause_set: List[List[int]]) -> int:
-#     """
-#     Returns the MOMS (Maximum Occurrence in clauses of Minimum Size) literal in clause_set
-#     """
-#     min_clauses = []
-#     min_length = -1
-#     for clause in clause_set:
-#         clause_len = len(clause)
-#         if clause_len < min_length or min_length == -1:
-#             min_clauses.append(clause)
-#             min_length = clause_len
-#
-#     return max_occurrence_literal(min_clauses)
-
-
-def propagate_assignment(clause_set: List[List[int]], assignment: int) -> List[List[int]]:
-    """
-    Propagates the variable assignment through clause_set to return a new clause_set.
-
-    e.g. ``propagate_assignment([[1, 2], [-1, -2]], 1) == [[-2]]``
-
-    Note that this can generate [[]+] (i.e. only unsatisfiable empty clauses remain) (F = [∅])
-
-    e.g. ``propagate_assignment([[1], [1]], -1) == [[], []]``
-    """
-
-    # create a deep copy since this is a nested list, and we don't want to modify in-place
-    new_clause_set = copy.deepcopy(clause_set)
-
-    sat_clause_indices = list()  # keep track of clauses that are satisfied by assignment
-    for i, clause in enumerate(new_clause_set):
-        clause_s = set(clause)  # speeds up lookups (in)
-        if assignment in clause_s:  # this clause is guaranteed to be satisfied
-            sat_clause_indices.append(i)  # add it to the removal list
-        elif -assignment in clause_s:
-            # remove all instances of this literal from the clause
-            # since that literal will always be false under the assignment
-            new_clause_set[i] = [literal for literal in clause_s if literal != -assignment]
-
-    for satisfied_i in reversed(sat_clause_indices):  # go backwards so pop indices are correct
-        # remove clauses satisfied by the assignment since these will now always be true
-        new_clause_set.pop(satisfied_i)
-
-    return new_clause_set
-
-
-def generate_all_assignments(variables: List[int]) -> Iterator[Set[int]]:
-    """
-    A *generator* that yields sets of every possible truth assignment (2^[num variables])
-     for the variables provided in variables. These are yielded as sets to speed up lookups (in)
-    e.g. For variables=[1, 2], yields {1, 2}, {-1, 2}, {1, -2}, {-1, -2} in this order
-
-    :param variables: List of literals to generate truth assignment permutations of.
-    :return: An iterator object that produces sets of integers (possible truth assignments).
-    """
-
-    if len(variables) == 1:  # down to component part - yield each variation
-        yield {variables[0]}
-        yield {-variables[0]}
-    elif len(variables) == 0:
-        yield set()
-    else:
-        for back_half in generate_all_assignments(variables[1:]):
-            yield {variables[0]}.union(back_half)
-            yield {-variables[0]}.union(back_half)
-
-
-def check_sat_assignment(clause_set: List[List[int]], assignment: List[int]) -> bool:
-    """
-    Confirms whether an assignment satisfies a clause set
-    :param clause_set: Clause set to satisfy
-    :param assignment: Literal assignment to test - possibly modulo pure and unit literals
-    :return: True is clause_set is satisfied by assignment. False otherwise
-    """
-
-    for ass in assignment:
-        clause_set = propagate_assignment(clause_set, ass)
-    clause_set = unit_propagate(clause_set)
-    clause_set = pure_literal_eliminate(clause_set)
-
-    if len(extract_variables(clause_set)) == 0:
-        return True
-    else:
-        return False
-
-
-# === REQUIRED FUNCTIONS ===
-def load_dimacs(filepath: str, print_comments: bool = False) -> List[List[int]]:
-    """
-    Write some Python code that loads a textual file in DIMACS format into an internal
-    representation of a clause set, for which we will use a list of lists.
-    For example, (v1 ∨ ¬v2) ∧ (¬v1 ∨ v3) would become [[1,−2], [−1, 3]].
-    (Any line starting with a c is a comment.)
-    [6 marks]
-
-    :param filepath: The full name of the DIMACS file to load (e.g. "sample_SAT.txt").
-        Can also include '/'s (e.g. "SAT/sample_SAT.txt")
-    :param print_comments: If True, lines starting with c in the dimacs file are printed
-    :return: A nested list representing a clause set - i.e. a list of clauses
-    :raises FileNotFoundError: If no file was found at path filepath
-    :raises Exception: If the file was found but there was error in parsing
-        (e.g. missing or incorrect values for N/M)
-    """
-
-    try:
-        with open(filepath, 'r') as fobj:
-            n, m = 0, 0
-            clause_set = list()
-            for i, line in enumerate(fobj.readlines()):
-                line = line.strip()  # remove leading and trailing whitespace
-                if not line:  # if the line is blank, skip processing it
-                    continue
-
-                if line[0] == 'c':  # comment line
-                    if print_comments:
-                        print(f'[{i}] Comment: {line[1:]}')
-                elif line[0] == 'p':  # header line at top of file
-                    match = re.match(r'p cnf (\d+) +(\d+)', line)
-                    if match:
-                        n, m = map(int, match.groups())
-                    else:
-                        raise Exception(f'DIMACS file ({filepath}) is in an unexpected format. '
-                                        f'Line {i+1} did not provide values '
-                                        'for N and M as expected.')
-                else:  # clause line
-                    # line = line.removesuffix(' 0')
-                    # clause = list(map(int, line.split(' ')))
-                    clause = [int(x) for x in re.findall(r'(?!0)-?\d+', line)]
-
-                    if clause:
-                        max_literal = max(map(abs, clause))
-                        if max_literal > n:
-                            raise Exception(f'DIMACS file ({filepath}) is in an unexpected format. '
-                                            f'Line {i+1} provided the literal {max_literal} which '
-                                            f'was higher than the expected max given by N, {n}.')
-                        clause_set.append(clause)
-
-                    elif print_comments:
-                        print(f'NB: No clause, header or comment was detected on line {i+1}.')
-
-        if len(clause_set) == m:
-            return clause_set
-        else:
-            raise Exception(f'The DIMACS file provided ({filepath}) claimed there were {m} total '
-                            f'clauses (M) but {len(clause_set)} were found.')
-
-    except FileNotFoundError:
-        raise FileNotFoundError(f'"{filepath}" was not found in the current working directory')
-
-
-def simple_sat_solve(clause_set: List[List[int]],
-                     print_all: bool = False) -> Union[List[int], bool]:
-    """
-    Write a Python function simple sat solve in a single argument clause_set that solves
-    the satisfiability of the clause set by running through all truth assignments. In case the
-    clause set is satisfiable it should output a satisfying assignment. A full (truth) assignment
-    should be represented by a list of literals. For example v1 ∧ ¬v2 ∧ v3 would be [1,−2, 3].
-    [10 marks]
-
-    :param clause_set: List of clauses to solve satisfiability of.
-    :param print_all: Boolean specifying whether to print every assignment as it is found.
-    :return: False if clause_set is not satisfiable. Otherwise, a satisfying truth assignment.
-    """
-
-    literals = extract_variables(clause_set)
-    for assignment_set in generate_all_assignments(literals):
-        # print(assignment_set)
-        set_is_sat = True
-        for clause in clause_set:
-            clause_is_sat = False
-            for literal in clause:
-                if literal in assignment_set:
-                    # only need one SAT literal per clause because each clause a disjunction
-                    clause_is_sat = True
-                    break
-            if not clause_is_sat:
-                set_is_sat = False  # all clauses must be SAT because conjunction
-                break
-
-        if set_is_sat:  # SAT
-            if print_all:
-                print(sort_literals(assignment_set))
-            else:
-                return list(assignment_set)
-
-    return False  # UNSAT
-
-
-def branching_sat_solve(clause_set: List[List[int]], partial_assignment: List[int],
-                        initial: bool = True) -> Union[List[int], bool]:
-    """
-    Write a recursive Python function branching_sat_solve in the two arguments clause_set
-    and partial_assignment that solves the satisfiability of the clause set by branching on the
-    two truth assignments for a given variable. In case the clause set is satisfiable under the
-    partial assignment it should output a satisfying assignment. When this is run with an empty
-    partial assignment it should act as a SAT-solver. A partial assignment should be represented by
-    a list of literals, as was a full assignment in the previous question.
-    [10 marks]
-
-    :param clause_set: List of clauses to solve satisfiability of.
-    :param partial_assignment: A list of assignments to propagate through clause_set initially.
-    :param initial: Do not change this default - it used by the function to skip propagating
-        partial_assignment when this has already been done by definition in outer calls.
-    :return: False if clause_set is unsatisfiable. Otherwise, a satisfying truth assignment.
-    """
-
-    if initial:  # clean up clause set if this is the initial call of the function
-        for assignment in partial_assignment:  # iterates through all given assignments
-            clause_set = propagate_assignment(clause_set, assignment)
-
-    # NB: bool([[]]) == True
-    #     bool([[], []]) == True
-    #     bool([]) == False
-    #     ∅ is the empty set
-    variables = extract_variables(clause_set)  # clause_set is referred to as F from here on
-    if not variables:  # variables == [] (var(F) = ∅)
-        if not clause_set:  # F == [] i.e. no clauses left to satisfy remain (F = ∅)
-            return partial_assignment  # SAT
-        else:  # F == [[]+] i.e. only unsatisfiable empty clauses remain (F = [∅])
-            return False  # UNSAT
-
-    elif 0 in map(len, clause_set):  # F contains an unsatisfiable empty clause
-        return False  # UNSAT
-
-    else:  # there still exist variables and non-empty clauses in F
-        x = clause_set[0][0]  # branch on first literal in clause set
-
-        for literal in [x, -x]:  # branch on var as well as on -var in that order
-            branch_partial_assignment = partial_assignment + [literal]
-            new_clause_set = propagate_assignment(clause_set, literal)
-            branch_result = branching_sat_solve(new_clause_set, branch_partial_assignment, False)
-            if branch_result is not False:  # if branch_result is a satisfying assignment
-                # is not False used because [] is a valid truth assignment but evaluates to False
-                return branch_result  # SAT
-
-        # implies x and -x branches are both False (i.e. UNSAT)
-        return False  # so whole tree at this point is UNSAT
-
-
-# def quad_unit_propagate(clause_set: List[List[int]]) -> List[List[int]]:
-#     # OLD QUADRATIC (n^2) CODE (? - 8Queens takes 0.606)
-#     def get_unit_literals(cs: List[List[int]]) -> List[int]:
-#         """
-#         Returns a list of all unit literals in the clause set cs
-#
-#         e.g. ``get_unit_literals([[1], [-2], [1, 2]]) == [1, -2]``
-#         """
-#
-#         return [clause[0] for clause in cs if len(clause) == 1]
-#
-#     new_clause_set = clause_set
-#
-#     unit_literals = get_unit_literals(new_clause_set)
-#     while unit_literals:
-#         for literal in unit_literals:
-#             new_clause_set = propagate_assignment(new_clause_set, literal)
-#         unit_literals = get_unit_literals(new_clause_set)
-#
-#     return new_clause_set
-
-
-def unit_propagate(clause_set: List[List[int]],
-                   abort_on_contra: bool = False) -> Union[List[List[int]], str]:
-    """
-    Write a Python function unit propagate in a single argument clause_set which outputs
-    a new clause set after iteratively applying unit propagation until it cannot be applied further.
-    [10 marks]
-
-    :param clause_set: Clause set to apply unit propagation to.
-    :param abort_on_contra: If True, the function will immediately halt when an unsatisfiable clause
-        (i.e. []) is formed by the unit propagation and return 'contradiction'
-    :return: Clause set after unit propagation has been applied.
-         I.e. all clauses of length 1 (e.g. [1]) are removed from the clause set
-         and the deduced assignment propagated
-    """
-
-    # linear time algorithm (? - 8Queens takes 0.255)
-    # implemented based on https://en.wikipedia.org/wiki/Unit_propagation#Complexity
-
-    def add_key_val(dict_: Dict[int, list], key, val):
-        if key in dict_:
-            dict_[key].append(val)
-        else:
-            dict_[key] = [val]
-
-    tracker: Dict[int, list] = dict()
-    unit_literals = set()
-    # iterate through all n literals in the clause set and note where each variable occurs
-    for i, clause in enumerate(clause_set):
-        if len(clause) == 1:  # unit clause
-            literal = clause[0]
-            unit_literals.add(literal)
-            add_key_val(tracker, abs(literal), i)
-        else:
-            for literal in clause:
-                add_key_val(tracker, abs(literal), i)
-
-    # new_clause_set = copy.deepcopy(clause_set)  # we're allowed to work in-place
-    clauses_to_remove = set()
-    # work through clause set propagating unit literals until there are none left
-    while unit_literals:
-        literal_to_propagate = unit_literals.pop()  # pick any unit literal
-        affected_clauses = tracker[abs(literal_to_propagate)]  # where does this variable occur?
-        for clause_i in affected_clauses:
-            if literal_to_propagate in clause_set[clause_i]:  # exact literal present...
-                # (note that this includes the unit clauses themselves)
-                clauses_to_remove.add(clause_i)  # so clause satisfied so mark for removal
-            else:  # negation of literal present instead... just remove it
-                new_clause = []
-                remaining = 0  # count how many literals remain in clause after unit literal removal
-                for literal in clause_set[clause_i]:
-                    if literal != -literal_to_propagate:  # include all bar the negation of the unit
-                        new_clause.append(literal)
-                        remaining += 1
-                clause_set[clause_i] = new_clause  # update original clause set with new clause
-
-                if remaining == 1:  # in case a new unit clause has been formed
-                    unit_literals.add(new_clause[0])
-                elif remaining == 0 and abort_on_contra:  # a clause of length [] is a contradiction
-                    return 'contradiction'  # abort immediately if abort_on_contra given
-
-        tracker[abs(literal_to_propagate)] = []  # no instances of the variable should remain
-
-    for clause_i in sorted(clauses_to_remove, reverse=True):  # go backwards so pop indices correct
-        clause_set.pop(clause_i)  # actually remove all created unit clauses
-
-    return clause_set
-
-
-def pure_literal_eliminate(clause_set: List[List[int]]) -> List[List[int]]:
-    """
-    Write a Python function pure literal eliminate in a single argument clause set which
-    outputs a new clause set after iteratively applying the pure literal assignment scheme until it
-    cannot be applied further.
-    [10 marks]
-
-    :param clause_set: Clause set to apply pure literal elimination to.
-    :return: Clause set after pure literal elimination has been applied iteratively.
-        I.e. if a literal x is pure (only x appears in the clause set) then it is removed
-        and the deduced assignment propagated.
-    """
-
-    # tracks whether -l and l have been seen
-    literal_tracker = {variable: [False, False] for variable in extract_variables(clause_set)}
-
-    for clause in clause_set:
-        for literal in clause:  # update tracker for each variable
-            literal_tracker[abs(literal)][literal > 0] = True
-
-    pure_literals = set()
-    for var, lit_status in literal_tracker.items():
-        # all(status) => [True, True] => var and -var present
-        if not all(lit_status):  # either both False or only one False
-            if lit_status[0]:  # [True, False] => only -var present in clause_set
-                pure_literals.add(-var)
-            elif lit_status[1]:  # [False, True] => only var present in clause_set
-                pure_literals.add(var)
-
-    if pure_literals:
-        # remove any clauses containing pure literals from the clause_set then re-detect any PLs
-        # using set intersections is notably faster than verifying existence using in
-        clause_set = [
-            clause for clause in clause_set if not set(clause).intersection(pure_literals)
-        ]
-        return pure_literal_eliminate(clause_set)
-
-    return clause_set
-
-
-def dpll_sat_solve(clause_set: List[List[int]], partial_assignment: List[int], initial: bool = True,
-                   use_max_heuristic: bool = True) -> Union[List[int], bool]:
-    """
-    Write a recursive Python function dpll sat solve in the two arguments clause set and
-    partial assignment that solves the satisfiability of the clause set by applying unit propagation
-    and pure literal elimination before branching on the two truth assignments for a given
-    variable (this is the famous DPLL algorithm). In case the clause set is satisfiable under the
-    partial assignment it should output a satisfying assignment. When this is run with an empty
-    partial assignment it should act as a SAT-solver.
-    [20 marks]
-
-    :param clause_set: List of clauses to solve satisfiability of.
-    :param partial_assignment: A list of assignments to propagate through clause_set initially.
-    :param initial: Do not change this default - it used by the function to skip propagating
-        partial_assignment when this has already been done by definition in outer calls.
-    :param use_max_heuristic: If True, chooses the most common literal in the clause
-        set each time to branch on. Otherwise, simply branches on the 1st literal in the clause set
-    :return: False if clause_set is not satisfiable. Otherwise, a satisfying truth assignment
-        MODULO PURE LITERALS AND UNIT CLAUSES.
-    """
-
-    if initial:
-        for assignment in partial_assignment:
-            clause_set = propagate_assignment(clause_set, assignment)
-
-    # applies UP and PLE *in-place*
-    if unit_propagate(clause_set, abort_on_contra=True) == 'contradiction':
-        return False  # UNSAT - an unsatisfiable clause (i.e. []) was found in clause_set after UP
-    pure_literal_eliminate(clause_set)
-
-    variables = extract_variables(clause_set)
-    if not variables:
-        if not clause_set:
-            return sort_literals(partial_assignment)  # SAT
-        else:
-            return False  # UNSAT
-    # elif 0 in map(len, clause_set):  # F contains an unsatisfiable empty clause
-    #     return False  # UNSAT
-    else:
-        if use_max_heuristic:
-            x = max_occurrence_literal(clause_set)  # branch on most common literal
-        else:
-            x = clause_set[0][0]  # branch on first literal of clause set by default
-
-        for literal in [x, -x]:
-            branch_partial_assignment = partial_assignment + [literal]
-            new_clause_set = propagate_assignment(clause_set, literal)
-            branch_result = dpll_sat_solve(new_clause_set,
-                                           branch_partial_assignment,
-                                           False, use_max_heuristic)
-            if branch_result is not False:
-                return branch_result  # SAT
-
-        return False  # UNSAT
-
-
-# === OWN TESTING ===
-# if __name__ == '__main__':
-#     # print(simple_sat_solve([]))
-#
-#     def test_file(path, n=10, average=True):
-#         print(f'###TESTING {path}###')
-#         test_clause_set = load_dimacs(path)
-#         # print(test_clause_set)
-#         start = time.time()
-#         dpll_output = dpll_sat_solve(test_clause_set, [], use_max_heuristic=True)
-#         print(time.time() - start, dpll_output)
-#         if dpll_output is not False:  # could be [] which is valid
-#             if not check_sat_assignment(load_dimacs(path), dpll_output):
-#                 print('OUTPUT INVALID')
-#
-#         if average:
-#             print(' - Average time tests:')
-#             total = 0
-#             for _ in trange(n):
-#                 test_clause_set = load_dimacs(path)
-#                 start = time.time()
-#                 dpll_sat_solve(test_clause_set, [], use_max_heuristic=True)
-#                 total += time.time() - start
-#
-#             print(f'Averaged over {n} tests: {total/n}s')
-#
-#
-#     # test_file('Sample SAT tests/W_2,3_ n=8 (SAT).txt')
-#     test_file('Sample SAT tests/8queens (SAT).txt', average=True)
-#     test_file('Sample SAT tests/hole6 (UNSAT).txt')
-#     # test_file('Sample SAT tests/uf50-01.cnf', average=False)
-#     # test_file('Sample SAT tests/uuf50-01.cnf', average=False)
-#     test_file('Sample SAT tests/uf100-01.cnf', average=True)
-#     # test_file('Sample SAT tests/uuf100-01.cnf', average=True)
-#     test_file('Sample SAT tests/uf150-01.cnf', average=False)
-#     # test_file('Sample SAT tests/uuf150-01.cnf', average=False)
-#
-#     # start = time.time()
-#     # print(simple_sat_solve(test_clause_set, print_all=True), 'simple', time.time() - start)
-#     # start = time.time()
-#     # print(branching_sat_solve(test_clause_set, []), 'branching', time.time() - start)
-#
-#     # Practical Exercises Wk14 Q7.3:
-#     practical_ex = [[1, 2, 3], [1, -2, -4], [2, -3, 4], [-1, 3, 4], [-1, 2, -4],
-#                     [1, -2, -3], [-1, -2, 4], [-1, -3, -4]]
-#     print(simple_sat_solve(practical_ex))
-#     print(branching_sat_solve(practical_ex, []))
-#     print(dpll_sat_solve(practical_ex, []))
+# Copy of code written for SAT solving coursework in Computational Thinking Module at Durham University
+# Received 68/76 total marks (all lost on efficiency of unit_propagate, pure_literal_eliminate and dpll_sat_solve)
+
+import argparse
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import mmap
+import multiprocessing
+import multiprocessing.synchronize
+import os
+import random
+import re
+import sqlite3
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections import Counter, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from itertools import chain, repeat
+from multiprocessing import shared_memory
+from typing import List, Set, Iterator, Iterable, Dict, Union, Optional, Tuple, BinaryIO, Deque, Callable
+
+try:
+    import numpy as np
+except ImportError:  # optional - bit-parallel brute force falls back to Python ints as bit vectors
+    np = None
+try:
+    import resource
+except ImportError:  # optional (Unix only) - SolverStats.peak_memory is then left as 0
+    resource = None
+
+
+# from tqdm import trange
+
+
+# === OWN HELPER FUNCTIONS ===
+def sort_literals(literal_iterable: Iterable[int]) -> List[int]:
+    """
+    Sorts the iterable of literals given by each literal's absolute value (i.e. ignoring negation).
+    This is most useful for readability and for ensuring consistent ordering in other functions.
+
+    e.g. ``sort_literals([3, -2, -1]) == [-1, -2, 3]``
+    """
+
+    return sorted(list(literal_iterable), key=lambda x: abs(x))
+
+
+def is_tautology(clause: Iterable[int]) -> bool:
+    """
+    Checks whether clause contains both a literal and its negation, so is satisfied by every
+    assignment. The solvers drop such clauses, so may leave variables only they contain unassigned.
+
+    e.g. ``is_tautology([1, -2, -1])`` is True but ``is_tautology([1, -2])`` is False
+    """
+
+    literals = clause if isinstance(clause, (set, frozenset)) else set(clause)
+    return any(-literal in literals for literal in literals)
+
+
+def _clause_tuples(clause_set: Union[List[List[int]], 'ClauseArena']
+                   ) -> Optional[List[Tuple[int, ...]]]:
+    """
+    :return: Every clause of clause_set other than tautologies (which always hold) as a sorted
+        tuple of its distinct literals, or None if clause_set contains an empty clause (which
+        can never be satisfied)
+    """
+
+    clauses = list()
+    for clause in clause_set:
+        literals = set(clause)
+        if not literals:
+            return None
+        if not is_tautology(literals):
+            clauses.append(tuple(sorted(literals)))
+    return clauses
+
+
+def extract_variables(clause_set: List[List[int]], clean: bool = True) -> List[int]:
+    """
+    Extracts a sorted list of all unique variables from clause_set.
+
+    e.g. ``extract_variables([[-1], [-2, 1], [3]]) == [1, 2, 3]``
+
+    If clean is False, then the above would return ``[-1, -2, 1, 3]``.
+    In this case, negated values are treated as unique and the output is not sorted.
+    """
+
+    literals = [literal for clause in clause_set for literal in clause]  # flatten clause_set
+    if clean:
+        literals = set(map(abs, literals))  # remove duplicates and remove negations
+        literals = list(literals)  # sort_literals(literals)
+    else:
+        literals = set(literals)
+    return literals
+
+
+def max_occurrence_literal(clause_set: List[List[int]]) -> int:
+    """
+    Returns the literal most commonly occurring in clause_set
+    """
+    literals = [literal for clause in clause_set for literal in clause]  # flatten clause_set
+    return Counter(literals).most_common(1)[0][0]  # select the 1 most common literal
+
+
+# def moms(clause_set: List[List[int]]) -> int:
+#     """
+#     Returns the MOMS (Maximum Occurrence in clauses of Minimum Size) literal in clause_set
+#     """
+#     min_clauses = []
+#     min_length = -1
+#     for clause in clause_set:
+#         clause_len = len(clause)
+#         if clause_len < min_length or min_length == -1:
+#             min_clauses.append(clause)
+#             min_length = clause_len
+#
+#     return max_occurrence_literal(min_clauses)
+
+
+def propagate_assignment(clause_set: List[List[int]], assignment: int) -> List[List[int]]:
+    """
+    Propagates the variable assignment through clause_set to return a new clause_set.
+
+    e.g. ``propagate_assignment([[1, 2], [-1, -2]], 1) == [[-2]]``
+
+    Note that this can generate [[]+] (i.e. only unsatisfiable empty clauses remain) (F = [∅])
+
+    e.g. ``propagate_assignment([[1], [1]], -1) == [[], []]``
+    """
+
+    # build a new outer list rather than deep copying clause_set - clauses the assignment does not
+    # touch are shared with clause_set since no function here modifies a clause list in-place
+    new_clause_set = list()
+    for clause in clause_set:
+        if assignment in clause:  # this clause is guaranteed to be satisfied so is dropped
+            continue
+        elif -assignment in clause:
+            # remove all instances of this literal from the clause
+            # since that literal will always be false under the assignment
+            new_clause_set.append([literal for literal in set(clause) if literal != -assignment])
+        else:
+            new_clause_set.append(clause)
+
+    return new_clause_set
+
+
+def generate_all_assignments(variables: List[int]) -> Iterator[Set[int]]:
+    """
+    A *generator* that yields sets of every possible truth assignment (2^[num variables])
+     for the variables provided in variables. These are yielded as sets to speed up lookups (in)
+    e.g. For variables=[1, 2], yields {1, 2}, {-1, 2}, {1, -2}, {-1, -2} in this order
+
+    :param variables: List of literals to generate truth assignment permutations of.
+    :return: An iterator object that produces sets of integers (possible truth assignments).
+    """
+
+    if len(variables) == 1:  # down to component part - yield each variation
+        yield {variables[0]}
+        yield {-variables[0]}
+    elif len(variables) == 0:
+        yield set()
+    else:
+        for back_half in generate_all_assignments(variables[1:]):
+            yield {variables[0]}.union(back_half)
+            yield {-variables[0]}.union(back_half)
+
+
+def _bit_patterns(num_bits: int) -> Tuple[object, List[object]]:
+    """
+    Builds the bit vectors (of length 2^num_bits) used by bit_parallel_assignments: a vector of
+    all ones and, for each j < num_bits, the vector whose bit a is set iff bit j of a is set.
+    These are arrays of uint64 words (64 bits per word) if NumPy is available or Python ints
+    (which act as arbitrarily long bit vectors) otherwise - both support &, | and ^.
+    """
+
+    size = 1 << num_bits
+    if np is None:
+        full = (1 << size) - 1
+        patterns = list()
+        for j in range(num_bits):
+            pattern = ((1 << (1 << j)) - 1) << (1 << j)  # 2^j zeros then 2^j ones
+            length = 1 << (j + 1)
+            while length < size:  # repeat the pattern by doubling it
+                pattern |= pattern << length
+                length *= 2
+            patterns.append(pattern)
+        return full, patterns
+
+    words = max(1, size // 64)
+    full = np.full(words, (1 << min(size, 64)) - 1, dtype=np.uint64)
+    index = np.arange(words, dtype=np.uint64)
+    patterns = list()
+    for j in range(num_bits):
+        if j < 6:  # the pattern repeats within every word
+            word = sum(1 << a for a in range(64) if a >> j & 1)
+            patterns.append(np.full(words, word, dtype=np.uint64) & full)
+        else:  # whole words alternate between all zeros and all ones
+            patterns.append(np.where((index >> np.uint64(j - 6)) & np.uint64(1), full, 0)
+                            .astype(np.uint64))
+    return full, patterns
+
+
+def _set_bits(bits: object) -> Iterator[int]:
+    """
+    A *generator* that yields the index of every set bit in a bit vector from _bit_patterns.
+    """
+
+    if np is not None and isinstance(bits, np.ndarray):
+        unpacked = np.unpackbits(bits.astype('<u8').view(np.uint8), bitorder='little')
+        yield from np.flatnonzero(unpacked).tolist()
+    else:
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length() - 1
+            bits ^= lowest
+
+
+def bit_parallel_assignments(clause_set: List[List[int]], variables: List[int],
+                             block_bits: int = 16,
+                             should_stop: Optional[Callable[[], bool]] = None
+                             ) -> Iterator[List[int]]:
+    """
+    A *generator* that yields every satisfying truth assignment of clause_set over variables,
+    in the same order that generate_all_assignments produces them, by evaluating 2^block_bits
+    assignments at once.
+
+    Assignment number a sets variables[j] False iff bit j of a is set. The first block_bits
+    variables therefore follow a fixed pattern within each block of assignments, and every
+    literal over them becomes a bit vector with one bit per assignment. A clause is then the
+    OR of its literals' vectors (computed once) and each block is the AND of its clauses, so
+    the per-assignment loops run as word-wide (or big integer) operations instead of in Python.
+    The remaining variables are constant within a block, so any clause with a True literal over
+    them is skipped for that block.
+
+    e.g. ``list(bit_parallel_assignments([[1, 2]], [1, 2])) == [[1, 2], [-1, 2], [1, -2]]``
+
+    :param clause_set: List of clauses to find the satisfying assignments of.
+    :param variables: Variables to assign (e.g. from extract_variables).
+    :param block_bits: log2 of the number of assignments evaluated at once.
+    :param should_stop: Called before every block - if it returns True, no more are evaluated.
+    :return: An iterator over satisfying assignments, each a sorted list of literals.
+    """
+
+    k = min(block_bits, len(variables))
+    full, patterns = _bit_patterns(k)
+    position = {var: j for j, var in enumerate(variables)}
+
+    # for each clause, the vector of assignments in a block that satisfy its literals over the
+    # first k variables and the (position - k, is positive) of its other literals
+    low_clauses = list()
+    for clause in clause_set:
+        low = full ^ full  # (all zeros)
+        high = list()
+        for literal in clause:
+            j = position[abs(literal)]
+            if j < k:  # pattern has bits set where variables[j] is False
+                low = low | (full ^ patterns[j] if literal > 0 else patterns[j])
+            else:
+                high.append((j - k, literal > 0))
+        low_clauses.append((low, high))
+
+    for block in range(1 << (len(variables) - k)):
+        if should_stop is not None and should_stop():
+            return
+        sat = full
+        for low, high in low_clauses:
+            if any(((block >> j) & 1) != is_positive for j, is_positive in high):
+                continue  # a high literal is True throughout this block
+            sat = sat & low
+            if not (sat.any() if np is not None else sat):
+                break
+
+        for a in _set_bits(sat):
+            index = (block << k) | a
+            yield sort_literals(-var if (index >> j) & 1 else var
+                                for j, var in enumerate(variables))
+
+
+def check_sat_assignment(clause_set: List[List[int]], assignment: List[int]) -> bool:
+    """
+    Confirms whether an assignment satisfies a clause set
+    :param clause_set: Clause set to satisfy
+    :param assignment: Literal assignment to test - possibly modulo pure and unit literals
+        (and the variables of tautologies, which the solvers drop)
+    :return: True is clause_set is satisfied by assignment. False otherwise
+    """
+
+    clause_set = [clause for clause in clause_set if not is_tautology(clause)]
+    for ass in assignment:
+        clause_set = propagate_assignment(clause_set, ass)
+    clause_set = unit_propagate(clause_set)
+    clause_set = pure_literal_eliminate(clause_set)
+
+    if len(extract_variables(clause_set)) == 0:
+        return True
+    else:
+        return False
+
+
+_DIMACS_CHUNK_SIZE = 1 << 22  # number of bytes of a DIMACS file to parse at once (4 MiB)
+_DIMACS_SPECIAL_LINE = re.compile(rb'^[ \t]*[cp%][^\n]*', re.MULTILINE)  # comment/header/end
+
+
+def _open_dimacs(filepath: str) -> Union[BinaryIO, mmap.mmap]:
+    """
+    Opens filepath for reading bytes in chunks, transparently decompressing it if it was
+    compressed with gzip or xz (detected from the first bytes of the file rather than the name).
+    Uncompressed files are memory-mapped so reading a chunk does not go through a file buffer.
+    """
+
+    with open(filepath, 'rb') as fobj:
+        magic = fobj.read(6)
+        if magic.startswith(b'\x1f\x8b'):
+            return gzip.open(filepath, 'rb')
+        elif magic.startswith(b'\xfd7zXZ\x00'):
+            return lzma.open(filepath, 'rb')
+        elif not magic:  # empty files cannot be memory-mapped
+            return io.BytesIO()
+        return mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _dimacs_sections(fobj: Union[BinaryIO, mmap.mmap]) -> Iterator[Tuple[int, bytes, bool]]:
+    """
+    A *generator* that reads an opened DIMACS file (see _open_dimacs) in chunks of whole lines
+    and yields (index of first line, text, is special) for each block of clause lines and each
+    comment/header/% line (stripped, with is special True) between them. Stops after a % line.
+    """
+
+    line_i = 0  # index of the first line in chunk
+    leftover = b''  # a partial line at the end of the previous chunk
+    finished = False
+    while not finished:
+        chunk = fobj.read(_DIMACS_CHUNK_SIZE)
+        if chunk:
+            chunk = leftover + chunk
+            cut = chunk.rfind(b'\n') + 1  # only process whole lines
+            chunk, leftover = chunk[:cut], chunk[cut:]
+        else:  # end of file - process whatever is left
+            chunk, leftover = leftover, b''
+            finished = True
+
+        # clause lines between any comment/header lines are yielded as one block
+        start = 0
+        for special in _DIMACS_SPECIAL_LINE.finditer(chunk):
+            yield line_i, chunk[start:special.start()], False
+            line_i += chunk.count(b'\n', start, special.start())
+            start = special.end()
+
+            line = special.group().strip()
+            yield line_i, line, True
+            if line[:1] == b'%':  # % marks the end of the clauses
+                return
+        yield line_i, chunk[start:], False
+        line_i += chunk.count(b'\n', start)
+
+
+# === REQUIRED FUNCTIONS ===
+def load_dimacs(filepath: str, print_comments: bool = False,
+                compact: bool = False) -> Union[List[List[int]], 'ClauseArena']:
+    """
+    Write some Python code that loads a textual file in DIMACS format into an internal
+    representation of a clause set, for which we will use a list of lists.
+    For example, (v1 ∨ ¬v2) ∧ (¬v1 ∨ v3) would become [[1,−2], [−1, 3]].
+    (Any line starting with a c is a comment.)
+    [6 marks]
+
+    The file is streamed in chunks (memory-mapped if it is not compressed) and, other than in
+    chunks containing comments or the header, integers are parsed a chunk at a time rather than
+    line by line. Clauses are terminated by 0 so may span (or share) lines, and parsing stops
+    at a line starting with % (as used to end the SATLIB benchmark files).
+
+    :param filepath: The full name of the DIMACS file to load (e.g. "sample_SAT.txt").
+        Can also include '/'s (e.g. "SAT/sample_SAT.txt"). Files compressed with gzip
+        (e.g. "uf250-01.cnf.gz") or xz are decompressed transparently.
+    :param print_comments: If True, lines starting with c in the dimacs file are printed
+    :param compact: If True, clauses are loaded straight into a ClauseArena instead of a list
+    :return: A nested list representing a clause set - i.e. a list of clauses
+        (or a ClauseArena holding the same clauses if compact is True)
+    :raises FileNotFoundError: If no file was found at path filepath
+    :raises Exception: If the file was found but there was error in parsing
+        (e.g. missing or incorrect values for N/M)
+    """
+
+    n, m = 0, 0
+    clause_set = ClauseArena() if compact else list()
+    pending = array('i')  # literals of a clause that has not been terminated by a 0 yet
+
+    def add_clauses(text: bytes, first_line: int):
+        # parse every literal in text at once and check they are all in range
+        try:
+            literals = array('i', map(int, text.split()))
+        except (ValueError, OverflowError):  # some token is not a (32-bit) integer
+            for line_i, line in enumerate(text.split(b'\n'), first_line):  # find its line
+                for token in line.split():
+                    try:
+                        array('i', [int(token)])
+                    except (ValueError, OverflowError):
+                        raise Exception(f'DIMACS file ({filepath}) is in an unexpected format. '
+                                        f'Line {line_i+1} provided '
+                                        f'{token.decode(errors="replace")!r} which is not a '
+                                        'literal.') from None
+            raise
+        if literals:
+            max_literal = max(max(literals), -min(literals))
+            if max_literal > n:
+                line_i = first_line
+                for line_i, line in enumerate(text.split(b'\n'), first_line):  # find its line
+                    if any(abs(int(x)) == max_literal for x in line.split()):
+                        break
+                raise Exception(f'DIMACS file ({filepath}) is in an unexpected format. '
+                                f'Line {line_i+1} provided the literal {max_literal} which '
+                                f'was higher than the expected max given by N, {n}.')
+
+        if pending:  # continue the clause left unfinished by the previous text
+            literals = pending + literals
+        if compact:
+            used = clause_set.extend_zero_terminated(literals)
+        else:  # split literals into clauses at each 0
+            used = 0
+            while True:
+                try:
+                    end = literals.index(0, used)
+                except ValueError:
+                    break
+                clause_set.append(literals[used:end].tolist())
+                used = end + 1
+        pending[:] = literals[used:]
+
+    try:
+        with _open_dimacs(filepath) as fobj:
+            for line_i, line, is_special in _dimacs_sections(fobj):
+                if not is_special:
+                    add_clauses(line, line_i)
+                elif line[:1] == b'c':  # comment line
+                    if print_comments:
+                        print(f'[{line_i}] Comment: {line[1:].decode(errors="replace")}')
+                elif line[:1] == b'p':  # header line at top of file
+                    match = re.match(rb'p\s+cnf\s+(\d+)\s+(\d+)', line)
+                    if match:
+                        n, m = map(int, match.groups())
+                    else:
+                        raise Exception(f'DIMACS file ({filepath}) is in an unexpected format. '
+                                        f'Line {line_i+1} did not provide values '
+                                        'for N and M as expected.')
+
+        if pending:  # allow the final clause to be missing its terminating 0
+            clause_set.append(pending if compact else pending.tolist())
+
+        if len(clause_set) == m:
+            return clause_set
+        else:
+            raise Exception(f'The DIMACS file provided ({filepath}) claimed there were {m} total '
+                            f'clauses (M) but {len(clause_set)} were found.')
+
+    except FileNotFoundError:
+        raise FileNotFoundError(f'"{filepath}" was not found in the current working directory')
+
+
+def simple_sat_solve(clause_set: List[List[int]], print_all: bool = False,
+                     bit_parallel: bool = False,
+                     should_stop: Optional[Callable[[], bool]] = None
+                     ) -> Union[List[int], bool, None]:
+    """
+    Write a Python function simple sat solve in a single argument clause_set that solves
+    the satisfiability of the clause set by running through all truth assignments. In case the
+    clause set is satisfiable it should output a satisfying assignment. A full (truth) assignment
+    should be represented by a list of literals. For example v1 ∧ ¬v2 ∧ v3 would be [1,−2, 3].
+    [10 marks]
+
+    :param clause_set: List of clauses to solve satisfiability of.
+    :param print_all: Boolean specifying whether to print every assignment as it is found.
+        (iter_models enumerates satisfying assignments without trying all 2^n assignments)
+    :param bit_parallel: If True, evaluates blocks of assignments at once as bit vectors
+        (see bit_parallel_assignments) instead of one assignment at a time. The assignments are
+        still tried in the same order.
+    :param should_stop: Called every 1024 assignments (every block if bit_parallel) - if it
+        returns True, the search is abandoned.
+    :return: False if clause_set is not satisfiable. Otherwise, a satisfying truth assignment.
+        None if the search was stopped by should_stop before an answer was found.
+    """
+
+    literals = extract_variables(clause_set)
+    if bit_parallel:
+        for assignment in bit_parallel_assignments(clause_set, literals,
+                                                   should_stop=should_stop):
+            if print_all:
+                print(assignment)
+            else:
+                return assignment
+        if should_stop is not None and should_stop():
+            return None  # (the blocks may not all have been evaluated)
+        return False  # UNSAT
+
+    for count, assignment_set in enumerate(generate_all_assignments(literals)):
+        # print(assignment_set)
+        if should_stop is not None and not count & 1023 and should_stop():
+            return None
+        set_is_sat = True
+        for clause in clause_set:
+            clause_is_sat = False
+            for literal in clause:
+                if literal in assignment_set:
+                    # only need one SAT literal per clause because each clause a disjunction
+                    clause_is_sat = True
+                    break
+            if not clause_is_sat:
+                set_is_sat = False  # all clauses must be SAT because conjunction
+                break
+
+        if set_is_sat:  # SAT
+            if print_all:
+                print(sort_literals(assignment_set))
+            else:
+                return list(assignment_set)
+
+    return False  # UNSAT
+
+
+def branching_sat_solve(clause_set: List[List[int]], partial_assignment: List[int],
+                        initial: bool = True,
+                        should_stop: Optional[Callable[[], bool]] = None
+                        ) -> Union[List[int], bool, None]:
+    """
+    Write a recursive Python function branching_sat_solve in the two arguments clause_set
+    and partial_assignment that solves the satisfiability of the clause set by branching on the
+    two truth assignments for a given variable. In case the clause set is satisfiable under the
+    partial assignment it should output a satisfying assignment. When this is run with an empty
+    partial assignment it should act as a SAT-solver. A partial assignment should be represented by
+    a list of literals, as was a full assignment in the previous question.
+    [10 marks]
+
+    Branching and backtracking assign and unassign literals on a single Trail in-place rather than
+    copying clause_set at each branch.
+
+    :param clause_set: List of clauses to solve satisfiability of. This is not modified.
+    :param partial_assignment: A list of assignments to propagate through clause_set initially.
+    :param initial: Retained for compatibility with older callers. partial_assignment is now
+        always assigned on the trail, so this has no effect.
+    :param should_stop: Called after every conflict - if it returns True, the search is abandoned.
+    :return: False if clause_set is unsatisfiable. Otherwise, a satisfying truth assignment.
+        None if the search was stopped by should_stop before an answer was found.
+    """
+
+    trail = Trail(max((abs(literal) for clause in clause_set for literal in clause), default=0))
+    trail.grow(max((abs(literal) for literal in partial_assignment), default=0))
+    for assignment in partial_assignment:  # iterates through all given assignments
+        if trail.value[assignment] == -1:  # partial_assignment contradicts itself
+            return False
+        elif trail.value[assignment] == 0:
+            trail.enqueue(assignment)
+
+    result = _branching_search(clause_set, trail, should_stop)
+    if result:
+        return list(trail.trail)  # SAT
+    return result  # False if UNSAT, None if stopped
+
+
+def _branching_search(clause_set: List[List[int]], trail: 'Trail',
+                      should_stop: Optional[Callable[[], bool]] = None) -> Optional[bool]:
+    """
+    Branching search over the current assignment of trail.
+    Returns True (leaving the satisfying assignment on trail.trail), False if UNSAT or None if
+    should_stop returned True (after a conflict).
+
+    Rather than recursing once per decision (and so failing on instances deeper than Python's
+    recursion limit), this loops over an explicit decision stack: the decision levels of trail,
+    each starting with its decision literal, plus whether each is already on its second branch.
+    """
+
+    base = trail.decision_level
+    flipped: List[bool] = list()  # decision level above base -> whether -x is being tried
+    value = trail.value
+    while True:
+        # the clause set under the assignment is referred to as F from here on
+        x = 0  # first unassigned literal of the first clause not yet satisfied
+        for clause in clause_set:
+            unassigned = 0
+            for literal in clause:
+                if value[literal] == 1:
+                    break  # clause is satisfied
+                elif value[literal] == 0 and not unassigned:
+                    unassigned = literal
+            else:
+                if not unassigned:  # every literal is False - F contains an empty clause
+                    break
+                elif not x:
+                    x = unassigned
+        else:
+            if not x:  # F == [] i.e. no clauses left to satisfy remain (F = ∅)
+                return True  # SAT
+
+            trail.new_decision_level()  # branch on var first, then on -var (below)
+            trail.enqueue(x)
+            flipped.append(False)
+            continue
+
+        if should_stop is not None and should_stop():
+            trail.cancel_until(base)
+            return None
+
+        # this branch is UNSAT, so backtrack to the latest decision whose -var is untried
+        while flipped and flipped[-1]:  # both x and -x branches are False (i.e. UNSAT)
+            flipped.pop()
+        if not flipped:
+            trail.cancel_until(base)
+            return False  # so whole tree is UNSAT
+
+        level = base + len(flipped) - 1
+        literal = trail.trail[trail.trail_lim[level]]
+        trail.cancel_until(level)
+        trail.new_decision_level()
+        trail.enqueue(-literal)
+        flipped[-1] = True
+
+
+# def quad_unit_propagate(clause_set: List[List[int]]) -> List[List[int]]:
+#     # OLD QUADRATIC (n^2) CODE (? - 8Queens takes 0.606)
+#     def get_unit_literals(cs: List[List[int]]) -> List[int]:
+#         """
+#         Returns a list of all unit literals in the clause set cs
+#
+#         e.g. ``get_unit_literals([[1], [-2], [1, 2]]) == [1, -2]``
+#         """
+#
+#         return [clause[0] for clause in cs if len(clause) == 1]
+#
+#     new_clause_set = clause_set
+#
+#     unit_literals = get_unit_literals(new_clause_set)
+#     while unit_literals:
+#         for literal in unit_literals:
+#             new_clause_set = propagate_assignment(new_clause_set, literal)
+#         unit_literals = get_unit_literals(new_clause_set)
+#
+#     return new_clause_set
+
+
+def unit_propagate(clause_set: List[List[int]],
+                   abort_on_contra: bool = False) -> Union[List[List[int]], str]:
+    """
+    Write a Python function unit propagate in a single argument clause_set which outputs
+    a new clause set after iteratively applying unit propagation until it cannot be applied further.
+    [10 marks]
+
+    :param clause_set: Clause set to apply unit propagation to.
+    :param abort_on_contra: If True, the function will immediately halt when an unsatisfiable clause
+        (i.e. []) is formed by the unit propagation and return 'contradiction'
+    :return: Clause set after unit propagation has been applied.
+         I.e. all clauses of length 1 (e.g. [1]) are removed from the clause set
+         and the deduced assignment propagated
+    """
+
+    # linear time algorithm (? - 8Queens takes 0.255)
+    # implemented based on https://en.wikipedia.org/wiki/Unit_propagation#Complexity
+
+    def add_key_val(dict_: Dict[int, list], key, val):
+        if key in dict_:
+            dict_[key].append(val)
+        else:
+            dict_[key] = [val]
+
+    tracker: Dict[int, list] = dict()
+    unit_literals = set()
+    # iterate through all n literals in the clause set and note where each variable occurs
+    for i, clause in enumerate(clause_set):
+        if len(clause) == 1:  # unit clause
+            literal = clause[0]
+            unit_literals.add(literal)
+            add_key_val(tracker, abs(literal), i)
+        else:
+            for literal in clause:
+                add_key_val(tracker, abs(literal), i)
+
+    # new_clause_set = copy.deepcopy(clause_set)  # we're allowed to work in-place
+    clauses_to_remove = set()
+    # work through clause set propagating unit literals until there are none left
+    while unit_literals:
+        literal_to_propagate = unit_literals.pop()  # pick any unit literal
+        affected_clauses = tracker[abs(literal_to_propagate)]  # where does this variable occur?
+        for clause_i in affected_clauses:
+            if literal_to_propagate in clause_set[clause_i]:  # exact literal present...
+                # (note that this includes the unit clauses themselves)
+                clauses_to_remove.add(clause_i)  # so clause satisfied so mark for removal
+            else:  # negation of literal present instead... just remove it
+                new_clause = []
+                remaining = 0  # count how many literals remain in clause after unit literal removal
+                for literal in clause_set[clause_i]:
+                    if literal != -literal_to_propagate:  # include all bar the negation of the unit
+                        new_clause.append(literal)
+                        remaining += 1
+                clause_set[clause_i] = new_clause  # update original clause set with new clause
+
+                if remaining == 1:  # in case a new unit clause has been formed
+                    unit_literals.add(new_clause[0])
+                elif remaining == 0 and abort_on_contra:  # a clause of length [] is a contradiction
+                    return 'contradiction'  # abort immediately if abort_on_contra given
+
+        tracker[abs(literal_to_propagate)] = []  # no instances of the variable should remain
+
+    for clause_i in sorted(clauses_to_remove, reverse=True):  # go backwards so pop indices correct
+        clause_set.pop(clause_i)  # actually remove all created unit clauses
+
+    return clause_set
+
+
+def pure_literal_eliminate(clause_set: List[List[int]]) -> List[List[int]]:
+    """
+    Write a Python function pure literal eliminate in a single argument clause set which
+    outputs a new clause set after iteratively applying the pure literal assignment scheme until it
+    cannot be applied further.
+    [10 marks]
+
+    :param clause_set: Clause set to apply pure literal elimination to.
+    :return: Clause set after pure literal elimination has been applied iteratively.
+        I.e. if a literal x is pure (only x appears in the clause set) then it is removed
+        and the deduced assignment propagated.
+    """
+
+    # the number of clauses (not yet removed) each literal occurs in, so a literal becomes pure
+    # exactly when the count of its negation drops to 0 - the clause set is only scanned once
+    count = Counter(literal for clause in clause_set for literal in clause)
+    occurrences = defaultdict(list)  # literal -> indices of the clauses containing it
+    for i, clause in enumerate(clause_set):
+        for literal in set(clause):
+            occurrences[literal].append(i)
+
+    removed = [False] * len(clause_set)
+    pure_literals = [literal for literal in count if not count[-literal]]
+    while pure_literals:
+        # remove any clauses containing the pure literal and queue any literals this makes pure
+        for i in occurrences[pure_literals.pop()]:
+            if not removed[i]:
+                removed[i] = True
+                for literal in clause_set[i]:
+                    count[literal] -= 1
+                    if not count[literal] and count[-literal]:
+                        pure_literals.append(-literal)
+
+    return [clause for clause, is_removed in zip(clause_set, removed) if not is_removed]
+
+
+def dpll_sat_solve(clause_set: List[List[int]], partial_assignment: List[int], initial: bool = True,
+                   use_max_heuristic: bool = True, heuristic: Optional[str] = None,
+                   should_stop: Optional[Callable[[], bool]] = None,
+                   proof: Optional['DRATWriter'] = None, stats: Optional['SolverStats'] = None
+                   ) -> Union[List[int], bool, None]:
+    """
+    Write a recursive Python function dpll sat solve in the two arguments clause set and
+    partial assignment that solves the satisfiability of the clause set by applying unit propagation
+    and pure literal elimination before branching on the two truth assignments for a given
+    variable (this is the famous DPLL algorithm). In case the clause set is satisfiable under the
+    partial assignment it should output a satisfying assignment. When this is run with an empty
+    partial assignment it should act as a SAT-solver.
+    [20 marks]
+
+    Propagation is done through a single WatchedLiterals index built once per call, so branching
+    and backtracking only assign and unassign literals on its trail.
+
+    :param clause_set: List of clauses to solve satisfiability of. This is not modified.
+    :param partial_assignment: A list of assignments to propagate through clause_set initially.
+    :param initial: Retained for compatibility with older callers. partial_assignment is now
+        always applied to the watched literal index, so this has no effect.
+    :param use_max_heuristic: If True, chooses the most common literal in the clause
+        set each time to branch on. Otherwise, simply branches on the 1st literal in the clause set
+    :param heuristic: Overrides use_max_heuristic if given. One of DPLL_HEURISTICS:
+        'max_occurrence' (as use_max_heuristic=True), 'first_literal' (as use_max_heuristic=False)
+        or 'vsids' (the most active variable in recent conflicts with its saved phase - see VSIDS)
+    :param should_stop: Called after every conflict - if it returns True, the search is abandoned.
+    :param proof: If given, a DRAT proof is logged to it (see DRATWriter) - the negated decisions
+        of every branch that failed and a RAT clause for each pure literal. If clause_set is UNSAT,
+        this ends with the negation of partial_assignment (the empty clause if it is empty).
+    :param stats: If given, decisions, conflicts, propagations and time are counted in it
+        (see SolverStats).
+    :return: False if clause_set is not satisfiable. Otherwise, a satisfying truth assignment.
+        This includes the literals deduced by unit propagation and pure literal elimination,
+        but variables that became irrelevant may be left unassigned.
+        None if the search was stopped by should_stop before an answer was found.
+    """
+
+    if heuristic is None:
+        heuristic = 'max_occurrence' if use_max_heuristic else 'first_literal'
+    elif heuristic not in DPLL_HEURISTICS:
+        raise ValueError(f'Unknown heuristic {heuristic!r}. Expected one of {DPLL_HEURISTICS}.')
+
+    # the decisions each proof clause is conditional on (as a clause, so negated)
+    negated_decisions = None if proof is None else [-literal for literal in partial_assignment]
+
+    engine = WatchedLiterals(clause_set, stats)
+    engine.grow(max((abs(literal) for literal in partial_assignment), default=0))
+    for assignment in partial_assignment:
+        if engine.value[assignment] == -1:  # partial_assignment contradicts itself or a unit
+            if proof is not None:
+                proof.add(negated_decisions)
+            return False
+        elif engine.value[assignment] == 0:
+            engine.enqueue(assignment)
+
+    vsids = None
+    if heuristic == 'vsids':
+        vsids = VSIDS()
+        vsids.grow(engine.num_vars,
+                   Counter(literal for clause in clause_set for literal in clause))
+
+    if not engine.ok:
+        if proof is not None:
+            proof.add(negated_decisions)
+        return False  # UNSAT
+    with engine.stats.phase('solve'):
+        result = _dpll_search(engine, heuristic, vsids, should_stop, proof, negated_decisions)
+    engine.stats.update_peak_memory()
+    if result is None:
+        return None  # UNKNOWN
+    return sort_literals(engine.trail) if result else False
+
+
+DPLL_HEURISTICS = ('max_occurrence', 'first_literal', 'vsids')
+
+
+def _dpll_search(engine: 'WatchedLiterals', heuristic: str, vsids: Optional['VSIDS'],
+                 should_stop: Optional[Callable[[], bool]] = None,
+                 proof: Optional['DRATWriter'] = None,
+                 negated_decisions: Optional[List[int]] = None) -> Optional[bool]:
+    """
+    DPLL search over the current assignment of engine.
+    Returns True (leaving the satisfying assignment on engine.trail), False if UNSAT
+    or None if should_stop asked for the search to be abandoned.
+    If proof is given, the clauses this deduces (conditional on negated_decisions, which is
+    extended in place while branching) are logged to it.
+
+    As in _branching_search, this loops over an explicit decision stack (the decision levels of
+    engine) rather than recursing, so the search depth is not limited by Python's recursion limit.
+    """
+
+    base = engine.decision_level
+    flipped: List[bool] = list()  # decision level above base -> whether -x is being tried
+    counters = PolarityCounters(engine)  # (for pure literals, satisfied clauses and max_occurrence)
+    while True:
+        conflict = engine.propagate()
+        if conflict is not None:
+            engine.stats['conflicts'] += 1
+            if engine.stats.progress is not None:
+                engine.stats.checkpoint()
+            if vsids is not None:  # without conflict analysis, just bump the conflicting clause
+                for literal in engine.arena.clause(conflict):
+                    vsids.bump(abs(literal))
+                vsids.decay()
+            if should_stop is not None and should_stop():
+                return None  # UNKNOWN
+            if proof is not None:
+                proof.add(negated_decisions)
+
+            # an unsatisfiable clause was formed by unit propagation, so backtrack to the latest
+            # decision whose -x branch has not been tried yet
+            while flipped and flipped[-1]:
+                flipped.pop()
+                if proof is not None:  # both branches failed, so these decisions cannot all hold
+                    negated_decisions.pop()
+                    proof.add(negated_decisions)
+            if not flipped:
+                removed = engine.cancel_until(base)
+                if vsids is not None:
+                    vsids.unassigned(removed)
+                return False  # UNSAT
+
+            level = base + len(flipped) - 1
+            literal = engine.trail[engine.trail_lim[level]]
+            removed = engine.cancel_until(level)
+            counters.unassigned(removed)
+            if vsids is not None:
+                vsids.unassigned(removed)
+            flipped[-1] = True
+            if proof is not None:
+                negated_decisions[-1] = literal
+            engine.stats['decisions'] += 1
+            engine.new_decision_level()
+            engine.enqueue(-literal)
+            continue
+
+        while True:  # apply pure literal elimination until it cannot be applied further
+            counters.update()
+            if not counters.unsatisfied:
+                return True  # SAT - every clause is satisfied
+
+            pure_literals = counters.pop_pure()
+            if not pure_literals:
+                break
+            for literal in pure_literals:
+                engine.enqueue(literal)
+                if proof is not None:  # RAT on literal since every clause with -literal holds
+                    proof.add([literal] + negated_decisions)
+            engine.propagate()  # cannot conflict since no residual clause contains -literal
+
+        if heuristic == 'vsids':
+            x = vsids.pick(engine.value)  # branch on the most active variable
+        elif heuristic == 'max_occurrence':
+            x = counters.max_occurrence_literal()  # branch on most common literal
+        else:
+            x = counters.first_literal()  # branch on first literal of clause set by default
+
+        flipped.append(False)  # x is tried first, then -x once the x branch is UNSAT
+        if proof is not None:
+            negated_decisions.append(-x)
+        engine.stats['decisions'] += 1
+        engine.new_decision_level()
+        engine.enqueue(x)
+
+
+# === VERIFICATION ===
+def verify_assignment(clause_set: Union[List[List[int]], 'ClauseArena'],
+                      assignment: Iterable[int]) -> bool:
+    """
+    Checks that assignment satisfies every clause of clause_set in a single pass, using none of
+    the solvers' own propagation code (unlike check_sat_assignment, which also accepts partial
+    assignments that only satisfy clause_set after unit propagation and pure literal elimination).
+
+    e.g. ``verify_assignment([[1, -2], [2, 3]], [1, -2, 3])`` is True but
+    ``verify_assignment([[1, -2], [2, 3]], [1, -2])`` is False since no literal of [2, 3] is True
+    (check_sat_assignment accepts the latter since 3 is then a unit)
+
+    :param clause_set: Clause set (or ClauseArena) the assignment should satisfy.
+    :param assignment: Literals that are True. Variables not in it are treated as unassigned.
+    :return: True if assignment is consistent (does not contain a literal and its negation) and
+        contains a literal of every clause other than tautologies (which the solvers drop, so may
+        leave unassigned). False otherwise.
+    """
+
+    true_literals = set(assignment)
+    if any(-literal in true_literals for literal in true_literals):
+        return False  # a variable cannot be both True and False
+
+    for clause in clause_set:
+        if true_literals.isdisjoint(clause) and not is_tautology(clause):
+            return False  # no literal of clause is True
+    return True
+
+
+def verify_dimacs_assignment(filepath: str, assignment: Iterable[int]) -> bool:
+    """
+    Checks that assignment satisfies every clause in a DIMACS file (as in verify_assignment)
+    while streaming it, so the clause set is never loaded into memory. Files compressed with
+    gzip or xz are decompressed transparently (see load_dimacs).
+
+    :param filepath: The DIMACS file the assignment should satisfy.
+    :param assignment: Literals that are True. Variables not in it are treated as unassigned.
+    :return: True if assignment is consistent and satisfies every clause in filepath.
+        False otherwise.
+    """
+
+    true_literals = set(assignment)
+    if any(-literal in true_literals for literal in true_literals):
+        return False  # a variable cannot be both True and False
+
+    # each literal is mapped to a byte: 1 if it is True, 2 for the 0 ending a clause and 0
+    # otherwise, so a clause with no True literal is a run of 0 bytes ended by a 2 (one search)
+    # - only those clauses need parsing again, to check whether they are tautologies
+    flag = dict.fromkeys(true_literals, 1)
+    flag[0] = 2
+    pending = list()  # words of a clause that has not been terminated by a 0 yet
+    with _open_dimacs(filepath) as fobj:
+        for _, text, is_special in _dimacs_sections(fobj):
+            if is_special:
+                continue
+            words = pending + text.split()
+            flags = bytes(map(flag.get, map(int, words), repeat(0)))
+            for match in _UNSATISFIED_CLAUSE_FLAGS.finditer(flags):
+                if not is_tautology(map(int, words[match.start():match.end() - 1])):
+                    return False
+            pending = words[flags.rfind(2) + 1:]
+
+    # (the final clause may be missing its terminating 0)
+    literals = set(map(int, pending))
+    return not literals or not true_literals.isdisjoint(literals) or is_tautology(literals)
+
+
+_UNSATISFIED_CLAUSE_FLAGS = re.compile(rb'(?:^|(?<=\x02))\x00*\x02')
+
+
+# === COMPACT CLAUSE ARENA ===
+class ClauseArena:
+    """
+    A clause set stored in one flat array of 32-bit literals rather than as a list of lists.
+
+    Each clause is stored as a length header followed by its literals, and offsets[i] is the index
+    of the first literal of the i-th clause (which is also used as a reference to that clause).
+    e.g. ``[[1, -2], [3]]`` is stored as ``literals == array('i', [2, 1, -2, 1, 3])`` and
+    ``offsets == array('q', [1, 4])``
+
+    This costs 4 bytes per literal plus 12 per clause, instead of a list object per clause and
+    an int object per literal. Indexing or iterating over a ClauseArena gives each clause as a
+    list, so it can be passed anywhere a clause set is only read.
+    """
+
+    def __init__(self, clause_set: Iterable[Iterable[int]] = ()):
+        """
+        :param clause_set: Clauses to initially fill the arena with.
+        """
+
+        self.literals = array('i')
+        self.offsets = array('q')
+        self.num_vars = 0  # highest variable seen in any clause
+
+        for clause in clause_set:
+            self.append(clause)
+
+    def append(self, clause: Union[List[int], array]) -> int:
+        """
+        Adds clause to the end of the arena.
+
+        :return: The offset of the clause's first literal (i.e. a reference to the clause)
+        """
+
+        self.literals.append(len(clause))
+        offset = len(self.literals)
+        self.literals.extend(clause)
+        self.offsets.append(offset)
+        if clause:
+            self.num_vars = max(self.num_vars, max(clause), -min(clause))
+        return offset
+
+    def extend_zero_terminated(self, literals: array) -> int:
+        """
+        Appends every clause in literals, which lists clauses as in a DIMACS file - i.e. each
+        followed by a 0. The 0s are overwritten in place to become the next clause's length header,
+        so this only loops over clauses (not literals) in Python.
+
+        e.g. ``extend_zero_terminated(array('i', [1, -2, 0, 3, 0, 4])) == 5``
+        (the unterminated literal 4 is not added)
+
+        :return: The number of values in literals that were used
+        """
+
+        base = len(self.literals)
+        header = base  # index of the current clause's length header
+        self.literals.append(0)
+        self.literals.extend(literals)
+
+        start = 0
+        while True:
+            try:
+                end = literals.index(0, start)
+            except ValueError:
+                break
+            self.literals[header] = end - start
+            self.offsets.append(header + 1)
+            header = base + 1 + end  # the 0 ending this clause is the next clause's header
+            start = end + 1
+
+        del self.literals[header:]  # remove the unused header and any unterminated clause
+        if start > 1:
+            used = literals[:start]
+            self.num_vars = max(self.num_vars, max(used), -min(used))
+        return start
+
+    def clause(self, offset: int) -> List[int]:
+        """
+        :return: The clause whose first literal is at offset as a list of literals
+        """
+
+        return self.literals[offset:offset + self.literals[offset - 1]].tolist()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, i: int) -> List[int]:
+        return self.clause(self.offsets[i])
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for offset in self.offsets:
+            yield self.clause(offset)
+
+
+# === BINARY CNF CACHE ===
+# header: magic, format version, little-endian flag, N (variables), M (clauses), number of
+# values in the arena's literals array, size and mtime of the source DIMACS file, CRC-32 of the
+# offsets and literals that follow it (offsets first so both stay aligned when memory-mapped)
+_CNF_BINARY_HEADER = struct.Struct('<8sIIQQQQqI4x')  # padded to 64 bytes
+_CNF_BINARY_MAGIC = b'CNFARENA'
+_CNF_BINARY_VERSION = 1
+
+
+def _source_stamp(source: Optional[str]) -> Tuple[int, int]:
+    if source is None:
+        return 0, 0
+    stat = os.stat(source)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def save_cnf_binary(clause_set: Union[List[List[int]], ClauseArena], filepath: str,
+                    source: Optional[str] = None):
+    """
+    Saves clause_set in a pre-parsed binary format that load_cnf_binary can memory-map,
+    so repeated solves of the same formula do not pay for parsing DIMACS text each time.
+
+    :param clause_set: Clause set (or ClauseArena) to save.
+    :param filepath: Path of the binary file to write.
+    :param source: Path of the DIMACS file clause_set was loaded from (if any). Its size and
+        modification time are recorded so that the cache can later be detected as stale.
+    """
+
+    arena = clause_set if isinstance(clause_set, ClauseArena) else ClauseArena(clause_set)
+    checksum = zlib.crc32(arena.literals, zlib.crc32(arena.offsets))
+    header = _CNF_BINARY_HEADER.pack(_CNF_BINARY_MAGIC, _CNF_BINARY_VERSION,
+                                     sys.byteorder == 'little', arena.num_vars, len(arena),
+                                     len(arena.literals), *_source_stamp(source), checksum)
+    with open(filepath, 'wb') as fobj:
+        fobj.write(header)
+        fobj.write(arena.offsets)
+        fobj.write(arena.literals)
+
+
+def load_cnf_binary(filepath: str, source: Optional[str] = None,
+                    verify: bool = True) -> ClauseArena:
+    """
+    Loads a clause set saved by save_cnf_binary. The file is memory-mapped and the returned
+    ClauseArena reads straight from it, so this takes the same (near-instant) time regardless
+    of formula size. The arena is read-only - clauses cannot be appended to it.
+
+    :param filepath: Path of the binary file to load.
+    :param source: If given, the DIMACS file the cache should have been made from.
+    :param verify: If True, the checksum of the clauses is verified (a single pass over the data).
+    :return: A ClauseArena of the clauses in the file.
+    :raises FileNotFoundError: If no file was found at path filepath
+    :raises ValueError: If the file is not a valid cache (of this version) or is stale for source
+    """
+
+    with open(filepath, 'rb') as fobj:
+        if os.fstat(fobj.fileno()).st_size < _CNF_BINARY_HEADER.size:
+            raise ValueError(f'{filepath} is too short to be a binary CNF file.')
+        data = mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, little, num_vars, num_clauses, num_literals, size, mtime, checksum = \
+        _CNF_BINARY_HEADER.unpack_from(data)
+    if magic != _CNF_BINARY_MAGIC or version != _CNF_BINARY_VERSION:
+        raise ValueError(f'{filepath} is not a version {_CNF_BINARY_VERSION} binary CNF file.')
+    if source is not None and (size, mtime) != _source_stamp(source):
+        raise ValueError(f'{filepath} is stale - {source} has changed since it was saved.')
+
+    start = _CNF_BINARY_HEADER.size
+    middle = start + 8 * num_clauses
+    end = middle + 4 * num_literals
+    if len(data) != end:
+        raise ValueError(f'{filepath} is truncated or corrupted.')
+
+    view = memoryview(data)
+    offsets, literals = view[start:middle], view[middle:end]
+    if verify and zlib.crc32(literals, zlib.crc32(offsets)) != checksum:
+        raise ValueError(f'{filepath} failed its checksum so is corrupted.')
+
+    arena = ClauseArena()
+    if little == (sys.byteorder == 'little'):  # zero-copy
+        arena.offsets, arena.literals = offsets.cast('q'), literals.cast('i')
+    else:  # the file was written on a machine with the opposite byte order so must be copied
+        arena.offsets, arena.literals = array('q', offsets), array('i', literals)
+        arena.offsets.byteswap()
+        arena.literals.byteswap()
+    arena.num_vars = num_vars
+    return arena
+
+
+def load_dimacs_cached(filepath: str, cache_path: Optional[str] = None) -> ClauseArena:
+    """
+    Loads the DIMACS file at filepath through a binary cache (see save_cnf_binary), which is
+    created (or recreated if it is missing, stale or corrupted) by parsing the DIMACS text.
+    If the cache cannot be written, the parsed clauses are returned without it.
+
+    :param filepath: Path of the DIMACS file to load (as in load_dimacs).
+    :param cache_path: Path of the binary cache. Defaults to filepath with '.bin' appended.
+    :return: A ClauseArena of the clauses in filepath.
+    """
+
+    if cache_path is None:
+        cache_path = filepath + '.bin'
+
+    try:
+        return load_cnf_binary(cache_path, source=filepath)
+    except (FileNotFoundError, ValueError):
+        clause_set = load_dimacs(filepath, compact=True)
+        try:
+            save_cnf_binary(clause_set, cache_path, source=filepath)
+        except OSError:  # (e.g. a read-only directory) - the clauses are still loaded
+            pass
+        return clause_set
+
+
+# === ASSIGNMENT TRAIL ===
+class Trail:
+    """
+    An assignment that is modified in place as a search branches and backtracks.
+
+    Literals are assigned by appending them to the trail and each decision level is marked by the
+    trail index it starts at, so backtracking to a level only has to unassign the literals after
+    that marker (rather than restoring a copy of the whole clause set).
+
+    e.g. after ``t = Trail(3)``, ``t.enqueue(1)``, ``t.new_decision_level()`` and ``t.enqueue(-2)``,
+    ``t.cancel_until(0)`` leaves ``t.trail == [1]``
+    """
+
+    def __init__(self, num_vars: int = 0):
+        """
+        :param num_vars: Number of variables to allocate space for (this can be extended by grow)
+        """
+
+        self.num_vars = 0
+        # literal -> 1 (true), -1 (false) or 0 (unassigned); both polarities are always present
+        self.value: Dict[int, int] = dict()
+        self.level: List[int] = [0]  # variable -> decision level it was assigned at
+        self.reason: List[Optional[int]] = [None]  # variable -> reference to clause implying it
+        self.trail: List[int] = list()  # every assigned literal in the order they were assigned
+        self.trail_lim: List[int] = list()  # index into trail at which each decision level starts
+
+        self.grow(num_vars)
+
+    @property
+    def decision_level(self) -> int:
+        return len(self.trail_lim)
+
+    def grow(self, num_vars: int):
+        """
+        Extends all per-variable and per-literal data structures to cover variables up to num_vars
+        """
+
+        for var in range(self.num_vars + 1, num_vars + 1):
+            self.value[var] = 0
+            self.value[-var] = 0
+            self.level.append(0)
+            self.reason.append(None)
+        self.num_vars = max(self.num_vars, num_vars)
+
+    def enqueue(self, literal: int, reason: Optional[int] = None):
+        """
+        Assigns literal to be True at the current decision level because of reason
+        (None for decisions and unit clauses)
+        """
+
+        var = abs(literal)
+        self.value[literal] = 1
+        self.value[-literal] = -1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(literal)
+
+    def new_decision_level(self):
+        self.trail_lim.append(len(self.trail))
+
+    def cancel_until(self, level: int) -> List[int]:
+        """
+        Unassigns every literal assigned above decision level level (i.e. backjumps to level)
+
+        :return: The literals that were unassigned
+        """
+
+        if self.decision_level <= level:
+            return []
+
+        start = self.trail_lim[level]
+        removed = self.trail[start:]
+        for literal in removed:
+            self.value[literal] = 0
+            self.value[-literal] = 0
+            self.reason[abs(literal)] = None
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        return removed
+
+
+# === SOLVER STATISTICS ===
+class SolverStats(dict):
+    """
+    Counters and timings collected while a solver runs, for tuning heuristics on real workloads.
+
+    The counters are the items of the dict itself (so the solvers' hot loops only pay for a dict
+    increment), while clause sizes, phase times and memory are kept as attributes. Every solver
+    built on WatchedLiterals creates one as its stats, or can be given one to fill in.
+
+    e.g. after ``stats = SolverStats(progress=print, progress_interval=5)`` and
+    ``CDCLSolver(clause_set, stats=stats).solve()``, ``stats['conflicts']`` is the number of
+    conflicts, ``stats.phase_time['propagate']`` the seconds spent propagating and the stats were
+    printed every 5 seconds. ``stats.dump('stats.json')`` saves everything as JSON.
+    """
+
+    COUNTERS = ('decisions', 'propagations', 'conflicts', 'learned_clauses', 'restarts',
+                'reductions', 'deleted_clauses')
+
+    def __init__(self, progress: Optional[Callable[['SolverStats'], None]] = None,
+                 progress_interval: float = 1.0):
+        """
+        :param progress: If given, called with these stats at most every progress_interval
+            seconds during a search (checked after each conflict).
+        :param progress_interval: Number of seconds between calls to progress.
+        """
+
+        super().__init__(dict.fromkeys(self.COUNTERS, 0))
+        self.learned_sizes: Counter = Counter()  # learned clause length -> number learned
+        self.phase_time: Dict[str, float] = defaultdict(float)  # phase -> total seconds spent
+        self.peak_memory = 0  # peak resident memory of the process in bytes (0 if unavailable)
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self._next_progress = time.perf_counter() + progress_interval
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """
+        A context manager adding the wall time spent inside it to phase_time[name]
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_time[name] += time.perf_counter() - start
+
+    def update_peak_memory(self):
+        if resource is not None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # (ru_maxrss is in kilobytes on Linux but bytes on macOS)
+            self.peak_memory = peak if sys.platform == 'darwin' else peak * 1024
+
+    def checkpoint(self):
+        """
+        Calls progress if it is given and progress_interval seconds have passed since the last call
+        """
+
+        if self.progress is not None and time.perf_counter() >= self._next_progress:
+            self.update_peak_memory()
+            self.progress(self)
+            self._next_progress = time.perf_counter() + self.progress_interval
+
+    def to_dict(self) -> Dict:
+        """
+        :return: Every statistic as a dict of JSON types (learned_sizes has str keys)
+        """
+
+        return {**self, 'learned_sizes': {str(size): count for size, count
+                                          in sorted(self.learned_sizes.items())},
+                'phase_time': dict(self.phase_time), 'peak_memory': self.peak_memory}
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def dump(self, filepath: str, indent: Optional[int] = 2):
+        """
+        Writes to_json to filepath
+        """
+
+        with open(filepath, 'w') as fobj:
+            fobj.write(self.to_json(indent))
+
+
+# === WATCHED LITERAL PROPAGATION ===
+class WatchedLiterals(Trail):
+    """
+    A persistent two-watched-literal index over a clause set, propagating through the
+    assignment Trail it extends.
+
+    The clauses themselves are copied into a ClauseArena and referred to by their offset in it,
+    so the watch lists and reasons are lists of ints rather than of clause lists.
+
+    Every clause of length >= 2 is watched by its first two literals, so when a literal becomes
+    False only the clauses watching it are visited (rather than every clause containing its
+    variable, as in unit_propagate). Watches never need to be restored when backtracking since
+    unassigning literals can only make a watched literal unassigned again, never False.
+
+    e.g. after ``wl = WatchedLiterals([[-1, 2], [-2, 3]])`` and ``wl.enqueue(1)``,
+    ``wl.propagate()`` returns None and ``wl.trail == [1, 2, 3]``
+    """
+
+    def __init__(self, clause_set: Union[List[List[int]], ClauseArena],
+                 stats: Optional[SolverStats] = None):
+        """
+        :param clause_set: List of clauses (or ClauseArena) to index. This is not modified.
+        :param stats: Where to count propagations (etc.). A new SolverStats by default.
+        """
+
+        self.arena = ClauseArena()  # the literals of every clause in clauses
+        self.clauses: List[int] = list()  # references to original clauses of length >= 2
+        self.watches: Dict[int, List[int]] = dict()  # literal -> references to clauses watching it
+        self.qhead = 0  # index into trail of the next literal to propagate
+        self.ok = True  # becomes False once the clause set is shown to be UNSAT outright
+        self.stats = SolverStats() if stats is None else stats
+
+        super().__init__(max((abs(literal) for clause in clause_set for literal in clause),
+                             default=0))
+        for clause in clause_set:
+            self._add_input_clause(clause)
+
+    def grow(self, num_vars: int):
+        for var in range(self.num_vars + 1, num_vars + 1):
+            self.watches[var] = list()
+            self.watches[-var] = list()
+        super().grow(num_vars)
+
+    def _add_input_clause(self, clause: List[int]):
+        """
+        Adds a clause at decision level 0, simplifying it against the current level 0 assignment
+        """
+
+        literals = set(clause)
+        if is_tautology(literals):
+            return  # tautologies are always satisfied so can be dropped
+
+        clause = list()
+        for literal in sort_literals(literals):
+            if self.value[literal] == 1:
+                return  # already satisfied at level 0
+            elif self.value[literal] == 0:
+                clause.append(literal)  # drop literals already falsified at level 0
+
+        if not clause:  # an empty clause can never be satisfied
+            self.ok = False
+        elif len(clause) == 1:
+            self.enqueue(clause[0], None)
+        else:
+            cref = self.arena.append(clause)
+            self.clauses.append(cref)
+            self._watch(cref)
+
+    def _watch(self, cref: int):
+        self.watches[self.arena.literals[cref]].append(cref)
+        self.watches[self.arena.literals[cref + 1]].append(cref)
+
+    def cancel_until(self, level: int) -> List[int]:
+        removed = super().cancel_until(level)
+        self.qhead = min(self.qhead, len(self.trail))
+        return removed
+
+    def propagate(self) -> Optional[int]:
+        """
+        Applies unit propagation to every literal on the trail that has not yet been propagated.
+        Only the clauses watching the negation of each such literal are visited.
+
+        :return: A reference to a clause in which every literal is False if a conflict was found.
+            Otherwise, None.
+        """
+
+        value = self.value
+        watches = self.watches
+        trail = self.trail
+        literals = self.arena.literals
+
+        qhead = self.qhead  # (kept local, and counted into stats once, since this is the hot loop)
+        while qhead < len(trail):
+            false_literal = -trail[qhead]
+            qhead += 1
+
+            watchers = watches[false_literal]
+            i = j = 0  # watchers is compacted in place: [0, j) are kept, [i, end) are unvisited
+            while i < len(watchers):
+                cref = watchers[i]
+                i += 1
+
+                # make sure the falsified literal is the second watch (literals[cref + 1])
+                if literals[cref] == false_literal:
+                    literals[cref] = literals[cref + 1]
+                    literals[cref + 1] = false_literal
+
+                first = literals[cref]
+                if value[first] == 1:  # clause is already satisfied by the other watch
+                    watchers[j] = cref
+                    j += 1
+                    continue
+
+                for k in range(cref + 2, cref + literals[cref - 1]):  # look for a new watch
+                    literal = literals[k]
+                    if value[literal] != -1:
+                        literals[cref + 1] = literal
+                        literals[k] = false_literal
+                        watches[literal].append(cref)
+                        break
+                else:  # no replacement found so clause is unit (or conflicting) under first
+                    watchers[j] = cref
+                    j += 1
+                    if value[first] == -1:  # every literal in clause is False - conflict
+                        watchers[j:] = watchers[i:]  # keep the watchers that were not visited
+                        self.stats['propagations'] += qhead - self.qhead
+                        self.qhead = len(trail)
+                        return cref
+                    self.enqueue(first, cref)
+
+            del watchers[j:]
+
+        self.stats['propagations'] += qhead - self.qhead
+        self.qhead = qhead
+        return None
+
+    def residual_clauses(self) -> Iterator[List[int]]:
+        """
+        A *generator* that yields the unassigned literals of every clause not yet satisfied by the
+        current assignment - i.e. the clause set that propagate_assignment would have produced.
+        """
+
+        value = self.value
+        literals = self.arena.literals
+        for cref in self.clauses:
+            residual = list()
+            for literal in literals[cref:cref + literals[cref - 1]]:
+                if value[literal] == 1:
+                    break
+                elif value[literal] == 0:
+                    residual.append(literal)
+            else:
+                yield residual
+
+
+class PolarityCounters:
+    """
+    Counts how often each literal occurs in the clauses of a WatchedLiterals index that are not
+    yet satisfied, so pure literals (those whose negation no longer occurs) can be found without
+    rescanning the clause set at every search node.
+
+    The counts are only updated when a clause changes between satisfied and unsatisfied - each
+    clause keeps the number of its literals that are True - so assigning a literal costs a visit
+    to the clauses containing it. A literal whose count drops to 0 makes its negation pure (if
+    that still occurs), so it is queued as a candidate as it happens.
+
+    e.g. after ``wl = WatchedLiterals([[1, 2], [-1, 3]])``, ``pc = PolarityCounters(wl)`` and
+    ``wl.enqueue(1)``, ``pc.update()`` then ``pc.pop_pure() == [3]``
+    (with 1 True only [-1, 3] is left, in which 3 is pure)
+    """
+
+    def __init__(self, engine: WatchedLiterals):
+        """
+        :param engine: The index to count the clauses of, under its current assignment.
+        """
+
+        self.engine = engine
+        value = engine.value
+        literals = engine.arena.literals
+        self.occurrences: Dict[int, List[int]] = {literal: list() for literal in value}
+        self.count: Dict[int, int] = dict.fromkeys(value, 0)  # literal -> unsatisfied clauses
+        self.true_count: Dict[int, int] = dict()  # clause reference -> number of True literals
+        self.unsatisfied = 0  # number of clauses with no True literal
+        for cref in engine.clauses:
+            clause = literals[cref:cref + literals[cref - 1]]
+            for literal in clause:
+                self.occurrences[literal].append(cref)
+            true_count = sum(value[literal] == 1 for literal in clause)
+            self.true_count[cref] = true_count
+            if not true_count:
+                self.unsatisfied += 1
+                for literal in clause:
+                    self.count[literal] += 1
+
+        self.applied = len(engine.trail)  # number of literals on the trail the counts include
+        self.candidates = [literal for literal, count in self.count.items()
+                           if count and not self.count[-literal]]  # literals that may be pure
+
+    def update(self):
+        """
+        Updates the counts for every literal assigned since the last call
+        """
+
+        count = self.count
+        true_count = self.true_count
+        literals = self.engine.arena.literals
+        trail = self.engine.trail
+        while self.applied < len(trail):
+            for cref in self.occurrences[trail[self.applied]]:
+                true_count[cref] += 1
+                if true_count[cref] == 1:  # clause has just been satisfied
+                    self.unsatisfied -= 1
+                    for other in literals[cref:cref + literals[cref - 1]]:
+                        count[other] -= 1
+                        if not count[other] and count[-other]:
+                            self.candidates.append(-other)
+            self.applied += 1
+
+    def unassigned(self, removed: List[int]):
+        """
+        Restores the counts after the engine has unassigned removed (as returned by cancel_until)
+        """
+
+        count = self.count
+        true_count = self.true_count
+        literals = self.engine.arena.literals
+        start = len(self.engine.trail)  # (the index removed started at)
+        for literal in reversed(removed[:max(0, self.applied - start)]):  # (those counted)
+            for cref in self.occurrences[literal]:
+                true_count[cref] -= 1
+                if not true_count[cref]:  # clause is no longer satisfied
+                    self.unsatisfied += 1
+                    for other in literals[cref:cref + literals[cref - 1]]:
+                        count[other] += 1
+        self.applied = min(self.applied, start)
+        # the search only backtracks to assignments it had already removed every pure literal from
+        self.candidates.clear()
+
+    def pop_pure(self) -> List[int]:
+        """
+        :return: Every unassigned literal that is currently pure (taking them off the candidates)
+        """
+
+        value = self.engine.value
+        count = self.count
+        pure_literals = set()
+        while self.candidates:
+            literal = self.candidates.pop()
+            if not value[literal] and count[literal] and not count[-literal]:
+                pure_literals.add(literal)
+        return list(pure_literals)
+
+    def max_occurrence_literal(self) -> int:
+        """
+        :return: The unassigned literal occurring in the most unsatisfied clauses
+            (as max_occurrence_literal of the residual clause set)
+        """
+
+        value = self.engine.value
+        best, best_count = 0, 0
+        for literal, count in self.count.items():
+            if count > best_count and not value[literal]:
+                best, best_count = literal, count
+        return best
+
+    def first_literal(self) -> int:
+        """
+        :return: The first unassigned literal of the first unsatisfied clause
+        """
+
+        value = self.engine.value
+        literals = self.engine.arena.literals
+        for cref in self.engine.clauses:
+            if not self.true_count[cref]:
+                for literal in literals[cref:cref + literals[cref - 1]]:
+                    if not value[literal]:
+                        return literal
+        return 0
+
+
+# === BRANCHING HEURISTICS ===
+class VariableHeap:
+    """
+    A binary max-heap of variables ordered by their activity (a list shared with the owner of the
+    heap). The position of every variable in the heap is tracked, so a variable can be found
+    and moved up after its activity is increased in O(log n) rather than rebuilding the heap.
+
+    e.g. with ``h = VariableHeap([0, 1.0, 3.0, 2.0])`` and 1, 2 and 3 pushed,
+    ``h.pop() == 2`` then ``h.pop() == 3``
+    """
+
+    def __init__(self, activity: List[float]):
+        """
+        :param activity: List mapping each variable to its activity (index 0 is unused).
+        """
+
+        self.activity = activity
+        self.heap: List[int] = list()
+        self.position: List[int] = [-1]  # variable -> index in heap (-1 if not in the heap)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, var: int) -> bool:
+        return var < len(self.position) and self.position[var] >= 0
+
+    def grow(self, num_vars: int):
+        self.position.extend([-1] * (num_vars + 1 - len(self.position)))
+
+    def push(self, var: int):
+        if self.position[var] < 0:
+            self.heap.append(var)
+            self.position[var] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+
+    def pop(self) -> int:
+        """
+        Removes and returns the variable with the highest activity
+        """
+
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.position[top] = -1
+        if heap:
+            heap[0] = last
+            self.position[last] = 0
+            self._sift_down(0)
+        return top
+
+    def increased(self, var: int):
+        """
+        Restores the heap property after the activity of var has been increased
+        """
+
+        if self.position[var] >= 0:
+            self._sift_up(self.position[var])
+
+    def _sift_up(self, i: int):
+        heap, position, activity = self.heap, self.position, self.activity
+        var = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if activity[heap[parent]] >= activity[var]:
+                break
+            heap[i] = heap[parent]
+            position[heap[i]] = i
+            i = parent
+        heap[i] = var
+        position[var] = i
+
+    def _sift_down(self, i: int):
+        heap, position, activity = self.heap, self.position, self.activity
+        var = heap[i]
+        size = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and activity[heap[child + 1]] > activity[heap[child]]:
+                child += 1  # pick the more active child
+            if activity[heap[child]] <= activity[var]:
+                break
+            heap[i] = heap[child]
+            position[heap[i]] = i
+            i = child
+        heap[i] = var
+        position[var] = i
+
+
+class VSIDS:
+    """
+    The (exponential) Variable State Independent Decaying Sum branching heuristic with phase saving.
+
+    Each variable has an activity which is bumped whenever it takes part in a conflict. Rather
+    than decaying every activity after each conflict, the amount added by a bump is increased by
+    1 / decay (EVSIDS) so recent conflicts count for more. The unassigned variable with the
+    highest activity is picked from a VariableHeap and assigned the polarity it last had.
+    """
+
+    def __init__(self, decay: float = 0.95, seed: Optional[int] = None):
+        """
+        :param decay: Factor that older activity is effectively scaled by after each conflict.
+        :param seed: If given, initial activities are perturbed and initial phases are chosen
+            randomly (using this seed) to diversify the search from the default ordering.
+        """
+
+        self.decay_factor = decay
+        self.rng = random.Random(seed) if seed is not None else None
+        self.increment = 1.0
+        self.activity: List[float] = [0.0]
+        self.phase: List[int] = [0]  # variable -> literal it was last assigned as (saved phase)
+        self.heap = VariableHeap(self.activity)
+
+    def grow(self, num_vars: int, occurrences: Optional[Counter] = None):
+        """
+        Adds variables up to num_vars, initially ordered (and given the polarity) by how often
+        they occur in occurrences (cf. max_occurrence_literal) if given.
+        """
+
+        occurrences = occurrences or Counter()
+        most = max(occurrences.values(), default=0) or 1
+        self.heap.grow(num_vars)
+        for var in range(len(self.activity), num_vars + 1):
+            # scaled below 1 so that the first bumps soon dominate the initial ordering
+            activity = (occurrences[var] + occurrences[-var]) / (2 * most)
+            if self.rng is None:
+                self.phase.append(var if occurrences[var] >= occurrences[-var] else -var)
+            else:
+                activity += self.rng.random() * 0.5
+                self.phase.append(self.rng.choice((var, -var)))
+            self.activity.append(activity)
+            self.heap.push(var)
+
+    def bump(self, var: int):
+        self.activity[var] += self.increment
+        if self.activity[var] > 1e100:  # rescale everything before floats overflow
+            for i in range(1, len(self.activity)):
+                self.activity[i] *= 1e-100
+            self.increment *= 1e-100
+        self.heap.increased(var)
+
+    def decay(self):
+        self.increment /= self.decay_factor
+
+    def unassigned(self, literals: Iterable[int]):
+        """
+        Saves the phase of each literal just unassigned and makes its variable available again
+        """
+
+        for literal in literals:
+            var = abs(literal)
+            self.phase[var] = literal
+            self.heap.push(var)
+
+    def pick(self, value: Dict[int, int]) -> int:
+        """
+        :return: The saved phase of the most active unassigned variable or 0 if all are assigned.
+        """
+
+        heap = self.heap
+        while heap:
+            var = heap.pop()  # assigned variables are re-added by unassigned on backtracking
+            if value[var] == 0:
+                return self.phase[var]
+        return 0
+
+
+# === CDCL SOLVER ===
+def luby(i: int) -> int:
+    """
+    Returns the i-th term (counting from 0) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ...
+    which is used to space out restarts.
+
+    e.g. ``[luby(i) for i in range(7)] == [1, 1, 2, 1, 1, 2, 4]``
+    """
+
+    size, power = 1, 0
+    while size < i + 1:  # find the smallest complete subsequence (of length 2^k - 1) containing i
+        power += 1
+        size = 2 * size + 1
+    while size - 1 != i:  # the sequence is recursive so step down into the part containing i
+        size = (size - 1) >> 1
+        power -= 1
+        i = i % size
+    return 2 ** power
+
+
+RESTART_POLICIES = ('luby', 'glucose', 'none')
+
+
+class CDCLSolver(WatchedLiterals):
+    """
+    A conflict-driven clause learning (CDCL) SAT solver.
+
+    Unit propagation is done through the watched literal index inherited from WatchedLiterals
+    and variables are branched on using the VSIDS heuristic. When a conflict is found, it is
+    analysed back to the first unique implication point (1-UIP) to produce a learned clause and
+    the solver then backjumps non-chronologically to the second-highest decision level in that
+    clause (rather than simply undoing the most recent decision as dpll_sat_solve does).
+
+    The search is periodically restarted (keeping learned clauses and VSIDS activity) according to
+    restart_policy, and the learned clause database is periodically halved by deleting the
+    clauses with the highest LBD (literal block distance - the number of distinct decision levels
+    in the clause when learned) and lowest activity, so that memory use stays bounded.
+
+    e.g. ``CDCLSolver([[1, 2], [-1, 2], [-2, 3]]).solve() == [1, 2, 3]``
+    """
+
+    def __init__(self, clause_set: Union[List[List[int]], ClauseArena],
+                 restart_policy: str = 'glucose', luby_unit: int = 100,
+                 reduce_interval: int = 2000, reduce_increment: int = 300,
+                 decay: float = 0.95, seed: Optional[int] = None,
+                 proof: Optional['DRATWriter'] = None, stats: Optional[SolverStats] = None):
+        """
+        :param clause_set: List of clauses (or ClauseArena) to solve satisfiability of.
+            This is not modified.
+        :param restart_policy: One of RESTART_POLICIES. 'luby' restarts after luby(i) * luby_unit
+            conflicts; 'glucose' restarts when the average LBD of the last 50 learned clauses is
+            notably worse than the overall average (i.e. the current branch is learning badly);
+            'none' never restarts.
+        :param luby_unit: Number of conflicts that a single step of the Luby sequence represents.
+        :param reduce_interval: Number of conflicts before the learned clauses are first reduced.
+        :param reduce_increment: Amount the reduction interval grows by after each reduction.
+        :param decay: VSIDS activity decay factor (see VSIDS).
+        :param seed: If given, randomises the initial VSIDS ordering and phases (see VSIDS).
+        :param proof: If given, every learned and deleted clause is logged to it, ending with the
+            empty clause if the clause set is found to be UNSAT (without assumptions).
+        :param stats: Where to collect statistics (see SolverStats). A new SolverStats by default.
+            Its counters accumulate over every call to solve, so give each solver its own.
+        """
+
+        if restart_policy not in RESTART_POLICIES:
+            raise ValueError(f'Unknown restart policy {restart_policy!r}. '
+                             f'Expected one of {RESTART_POLICIES}.')
+
+        self._seen: List[bool] = [False]  # scratch space for conflict analysis
+        self._occurrences = Counter(literal for clause in clause_set for literal in clause)
+        self.vsids = VSIDS(decay, seed)
+
+        super().__init__(clause_set, stats)
+        self.learnts: List[int] = list()  # references to clauses learned from conflicts
+        self.clause_lbd: Dict[int, int] = dict()  # learned clause reference -> LBD
+        self.clause_activity: Dict[int, float] = dict()  # learned clause reference -> activity
+        self._clause_increment = 1.0
+        self.conflict_assumptions: List[int] = list()  # see _analyze_final
+        self.proof = proof
+
+        self.restart_policy = restart_policy
+        self.luby_unit = luby_unit
+        self._conflicts_since_restart = 0
+        self._recent_lbds: Deque[int] = deque(maxlen=50)  # for glucose-style restarts
+        self._recent_trail_sizes: Deque[int] = deque(maxlen=5000)  # for blocking restarts
+        self._lbd_total = 0
+
+        self.reduce_interval = reduce_interval
+        self.reduce_increment = reduce_increment
+        self._next_reduction = reduce_interval
+
+    def grow(self, num_vars: int):
+        if num_vars > self.num_vars:
+            self._seen.extend([False] * (num_vars - self.num_vars))
+            super().grow(num_vars)
+            self.vsids.grow(num_vars, self._occurrences)
+
+    def cancel_until(self, level: int) -> List[int]:
+        removed = super().cancel_until(level)
+        self.vsids.unassigned(removed)
+        return removed
+
+    def _analyze(self, conflict: int) -> Tuple[List[int], int]:
+        """
+        Analyses a conflict to find the first unique implication point (1-UIP) by resolving the
+        conflicting clause with the reasons for its literals in reverse trail order.
+
+        :return: The learned clause (whose first literal is the negated UIP and so will be
+            unit after backjumping) and the decision level to backjump to.
+        """
+
+        seen = self._seen
+        literals = self.arena.literals
+        clause_activity = self.clause_activity
+        learnt = [0]  # learnt[0] is filled in with the negated UIP at the end
+        current_level = self.decision_level
+        unresolved = 0  # literals at the current level that have not yet been resolved on
+        literal = 0
+        index = len(self.trail) - 1
+        cref = conflict
+
+        while True:
+            if cref in clause_activity:  # learned clauses used in conflicts are worth keeping
+                self._bump_clause(cref)
+            for other in literals[cref:cref + literals[cref - 1]]:
+                var = abs(other)
+                if other != literal and not seen[var] and self.level[var] > 0:
+                    seen[var] = True
+                    self.vsids.bump(var)
+                    if self.level[var] >= current_level:
+                        unresolved += 1
+                    else:
+                        learnt.append(other)
+
+            # walk back along the trail to the next literal involved in the conflict
+            while not seen[abs(self.trail[index])]:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            seen[abs(literal)] = False
+            unresolved -= 1
+            if unresolved == 0:  # literal is the first UIP
+                break
+            cref = self.reason[abs(literal)]
+
+        learnt[0] = -literal
+
+        # remove literals whose reason is made up entirely of other literals in the clause
+        minimised = [learnt[0]]
+        for other in learnt[1:]:
+            reason = self.reason[abs(other)]
+            if reason is None or any(not seen[abs(r)] and self.level[abs(r)] > 0
+                                     for r in literals[reason:reason + literals[reason - 1]]
+                                     if r != -other):
+                minimised.append(other)
+        for other in learnt:
+            seen[abs(other)] = False
+        learnt = minimised
+
+        if len(learnt) == 1:
+            return learnt, 0
+
+        # the second watch must be the literal at the highest level below the current one
+        max_i = max(range(1, len(learnt)), key=lambda i: self.level[abs(learnt[i])])
+        learnt[1], learnt[max_i] = learnt[max_i], learnt[1]
+        return learnt, self.level[abs(learnt[1])]
+
+    def _analyze_final(self, literal: int) -> List[int]:
+        """
+        Finds the assumptions responsible for the assumption literal being False by following the
+        reasons for its negation back to the decisions it depends on (which are all assumptions,
+        since they are always decided first).
+
+        :return: literal and the other assumptions which together cannot all be True.
+        """
+
+        failed = [literal]
+        if self.level[abs(literal)] == 0:
+            return failed  # False regardless of the other assumptions
+
+        seen = self._seen
+        literals = self.arena.literals
+        seen[abs(literal)] = True
+        for assigned in reversed(self.trail[self.trail_lim[0]:]):
+            var = abs(assigned)
+            if not seen[var]:
+                continue
+            seen[var] = False
+            cref = self.reason[var]
+            if cref is None:
+                failed.append(assigned)  # a decision, so an assumption
+            else:
+                for other in literals[cref + 1:cref + literals[cref - 1]]:  # [cref] is assigned
+                    if self.level[abs(other)] > 0:
+                        seen[abs(other)] = True
+        return failed
+
+    def _bump_clause(self, cref: int):
+        self.clause_activity[cref] += self._clause_increment
+        if self.clause_activity[cref] > 1e20:  # rescale everything before floats overflow
+            for other in self.clause_activity:
+                self.clause_activity[other] *= 1e-20
+            self._clause_increment *= 1e-20
+
+    def _should_restart(self) -> bool:
+        if self.restart_policy == 'luby':
+            return (self._conflicts_since_restart
+                    >= luby(self.stats['restarts']) * self.luby_unit)
+        elif self.restart_policy == 'glucose':
+            # restart if recent learned clauses are 25% worse (K = 0.8) than the overall average
+            return (len(self._recent_lbds) == self._recent_lbds.maxlen and
+                    sum(self._recent_lbds) / len(self._recent_lbds) * 0.8
+                    > self._lbd_total / self.stats['conflicts'])
+        return False
+
+    def _record_conflict(self, lbd: int):
+        """
+        Updates the counters restarts are based on after a conflict whose learned clause has LBD lbd
+        """
+
+        self._conflicts_since_restart += 1
+        self._lbd_total += lbd
+        if self.restart_policy == 'glucose':
+            # block the next restart if far more variables than usual are assigned, since the
+            # solver may be approaching a satisfying assignment
+            self._recent_trail_sizes.append(len(self.trail))
+            if (self.stats['conflicts'] > 10000 and
+                    len(self._recent_lbds) == self._recent_lbds.maxlen and
+                    len(self.trail) > 1.4 * sum(self._recent_trail_sizes)
+                    / len(self._recent_trail_sizes)):
+                self._recent_lbds.clear()
+            self._recent_lbds.append(lbd)
+
+    def _reduce_learnts(self):
+        """
+        Deletes half of the learned clauses, choosing those with the highest LBD (and then the lowest
+        activity). Clauses with an LBD of 2 or less ("glue" clauses) and clauses that are currently
+        the reason for an assignment are always kept. The arena is then compacted.
+        """
+
+        locked = set(self.reason)
+        candidates = [cref for cref in self.learnts
+                      if self.clause_lbd[cref] > 2 and cref not in locked]
+        candidates.sort(key=lambda cref: (self.clause_lbd[cref], -self.clause_activity[cref]))
+        deleted = set(candidates[len(candidates) // 2:])
+
+        self.learnts = [cref for cref in self.learnts if cref not in deleted]
+        self.stats['reductions'] += 1
+        self.stats['deleted_clauses'] += len(deleted)
+        if self.proof is not None:
+            for cref in deleted:
+                self.proof.delete(self.arena.clause(cref))
+        self._compact_arena()
+
+    def _compact_arena(self):
+        """
+        Copies every clause that is still in use into a new arena and re-points all references to
+        clauses (in clauses, learnts, reason and the watch lists) at their new position.
+        """
+
+        old = self.arena.literals
+        self.arena = ClauseArena()
+        moved = dict()
+        for cref in self.clauses + self.learnts:
+            moved[cref] = self.arena.append(old[cref:cref + old[cref - 1]])
+
+        self.clauses = [moved[cref] for cref in self.clauses]
+        self.learnts = [moved[cref] for cref in self.learnts]
+        self.clause_lbd = {moved[cref]: lbd for cref, lbd in self.clause_lbd.items()
+                           if cref in moved}
+        self.clause_activity = {moved[cref]: activity
+                                for cref, activity in self.clause_activity.items() if cref in moved}
+        self.reason = [None if cref is None else moved[cref] for cref in self.reason]
+
+        # the watched literals are still the first two of each clause so watches can be rebuilt
+        for watchers in self.watches.values():
+            watchers.clear()
+        for cref in self.clauses + self.learnts:
+            self._watch(cref)
+
+    def solve(self, assumptions: Iterable[int] = (),
+              should_stop: Optional[Callable[[], bool]] = None) -> Union[List[int], bool, None]:
+        """
+        Solves the satisfiability of the clause set under assumptions.
+
+        :param assumptions: Literals that must be True in any returned assignment. These are
+            assigned as the first decisions so are retracted when the search finishes.
+        :param should_stop: Called after every conflict - if it returns True, the search is
+            abandoned (e.g. because another solver has already found the answer).
+        :return: False if the clause set is not satisfiable under assumptions.
+            Otherwise, a full satisfying truth assignment.
+            None if the search was stopped by should_stop before an answer was found.
+        """
+
+        assumptions = list(assumptions)
+        self.grow(max((abs(literal) for literal in assumptions), default=0))
+        self.conflict_assumptions = list()
+
+        with self.stats.phase('solve'):
+            result = self._search(assumptions, should_stop)
+        self.stats.update_peak_memory()
+        return result
+
+    def _search(self, assumptions: List[int], should_stop: Optional[Callable[[], bool]]
+                ) -> Union[List[int], bool, None]:
+        """
+        The CDCL search loop of solve, timing its propagation and conflict analysis phases
+        """
+
+        clock = time.perf_counter
+        phase_time = self.stats.phase_time
+        if self.ok and self.propagate() is not None:  # level 0 units contradict each other
+            self.ok = False
+        if not self.ok:
+            if self.proof is not None:
+                self.proof.add([])
+            return False
+
+        while True:
+            start = clock()
+            conflict = self.propagate()
+            phase_time['propagate'] += clock() - start
+            if conflict is not None:
+                self.stats['conflicts'] += 1
+                if self.stats.progress is not None:
+                    self.stats.checkpoint()
+                if self.decision_level == 0:  # conflict does not depend on any decision
+                    self.ok = False
+                    if self.proof is not None:
+                        self.proof.add([])
+                    return False
+                if should_stop is not None and should_stop():
+                    self.cancel_until(0)
+                    return None  # UNKNOWN
+
+                start = clock()
+                learnt, backjump_level = self._analyze(conflict)
+                phase_time['analyze'] += clock() - start
+                if self.proof is not None:
+                    self.proof.add(learnt)
+                self.stats.learned_sizes[len(learnt)] += 1
+                lbd = len(set(self.level[abs(literal)] for literal in learnt))
+                self._record_conflict(lbd)
+                self.vsids.decay()
+                self._clause_increment /= 0.999
+
+                self.cancel_until(backjump_level)
+                if len(learnt) == 1:
+                    self.enqueue(learnt[0], None)  # now a fact at level 0
+                else:
+                    cref = self.arena.append(learnt)
+                    self.learnts.append(cref)
+                    self.clause_lbd[cref] = lbd
+                    self.clause_activity[cref] = 0.0
+                    self._bump_clause(cref)
+                    self._watch(cref)
+                    self.enqueue(learnt[0], cref)
+                self.stats['learned_clauses'] += 1
+
+            else:
+                if self._should_restart():  # keeps learned clauses and VSIDS activity
+                    self.cancel_until(0)
+                    self.stats['restarts'] += 1
+                    self._conflicts_since_restart = 0
+                    self._recent_lbds.clear()
+                if self.stats['conflicts'] >= self._next_reduction:
+                    with self.stats.phase('reduce'):
+                        self._reduce_learnts()
+                    self._next_reduction = (self.stats['conflicts'] + self.reduce_interval +
+                                            self.reduce_increment * self.stats['reductions'])
+
+                next_literal = 0
+                while self.decision_level < len(assumptions):  # assumptions are decided first
+                    assumption = assumptions[self.decision_level]
+                    if self.value[assumption] == 1:  # already True so add an empty level
+                        self.new_decision_level()
+                    elif self.value[assumption] == -1:  # contradicted - UNSAT under assumptions
+                        self.conflict_assumptions = self._analyze_final(assumption)
+                        self.cancel_until(0)
+                        return False
+                    else:
+                        next_literal = assumption
+                        break
+
+                if next_literal == 0:
+                    next_literal = self.vsids.pick(self.value)
+                    if next_literal == 0:  # all variables assigned without conflict - SAT
+                        model = [var if self.value[var] == 1 else -var
+                                 for var in range(1, self.num_vars + 1)]
+                        self.cancel_until(0)
+                        return model
+                    self.stats['decisions'] += 1
+
+                self.new_decision_level()
+                self.enqueue(next_literal, None)
+
+
+def cdcl_sat_solve(clause_set: List[List[int]], assumptions: List[int] = [],
+                   restart_policy: str = 'glucose', proof: Optional['DRATWriter'] = None
+                   ) -> Union[List[int], bool]:
+    """
+    Solves the satisfiability of clause_set using conflict-driven clause learning (see CDCLSolver).
+    Unlike dpll_sat_solve, conflicts are analysed to learn new clauses which prevent the same
+    conflict from reoccurring and allow the search to backjump over irrelevant decisions.
+
+    :param clause_set: List of clauses to solve satisfiability of. This is not modified.
+    :param assumptions: A list of literals which must hold in any satisfying assignment
+        (cf. partial_assignment in dpll_sat_solve).
+    :param restart_policy: How often to restart the search - one of RESTART_POLICIES.
+    :param proof: If given, a DRAT proof of unsatisfiability is logged to it (see DRATWriter).
+    :return: False if clause_set is not satisfiable under assumptions.
+        Otherwise, a full satisfying truth assignment (so check_sat_assignment can verify it).
+    """
+
+    return CDCLSolver(clause_set, restart_policy=restart_policy, proof=proof).solve(assumptions)
+
+
+# === DRAT PROOFS ===
+class DRATWriter:
+    """
+    Writes a DRAT proof of unsatisfiability (as checked by drat-trim or DRATChecker) - the clauses
+    a solver learned, in order, and the ones it deleted, ending with the empty clause.
+
+    Lines are built up in a bytearray and only written out once buffer_size bytes have collected,
+    so logging a clause costs a few appends rather than a write call. Solvers only log when given
+    a writer, so solving without a proof has no overhead beyond an ``is not None`` check.
+
+    In text mode each clause is written as in DIMACS (e.g. ``1 -2 0``) with deletions prefixed by
+    ``d``. The binary mode is drat-trim's compact format: ``a`` or ``d``, then each literal l as a
+    variable-length integer of 2 * abs(l) + (l < 0) (7 bits per byte, lowest first), then a 0 byte.
+
+    e.g. ``with DRATWriter('proof.drat') as proof: proof.add([1, -2]); proof.delete([1, 3])``
+    """
+
+    def __init__(self, file: Union[str, BinaryIO], binary: bool = False,
+                 buffer_size: int = 1 << 20):
+        """
+        :param file: Path of the file to write (which is opened and closed by the writer) or a file
+            object opened in binary mode (which is left open by close).
+        :param binary: If True, writes binary DRAT rather than text.
+        :param buffer_size: Number of bytes to buffer between writes to file.
+        """
+
+        self._owns_file = isinstance(file, str)
+        self.file = open(file, 'wb') if self._owns_file else file
+        self.binary = binary
+        self.buffer_size = buffer_size
+        self._buffer = bytearray()
+        self.stats = {'added': 0, 'deleted': 0}
+
+    def add(self, clause: Iterable[int]):
+        """
+        Logs that clause was learned (its first literal is used as the pivot of a RAT check)
+        """
+
+        self.stats['added'] += 1
+        self._write(b'a', clause)
+
+    def delete(self, clause: Iterable[int]):
+        """
+        Logs that clause was deleted from the clause database
+        """
+
+        self.stats['deleted'] += 1
+        self._write(b'd', clause)
+
+    def _write(self, kind: bytes, clause: Iterable[int]):
+        buffer = self._buffer
+        if self.binary:
+            buffer += kind
+            for literal in clause:
+                encoded = 2 * literal if literal > 0 else -2 * literal + 1
+                while encoded > 127:
+                    buffer.append(encoded & 127 | 128)
+                    encoded >>= 7
+                buffer.append(encoded)
+            buffer.append(0)
+        else:
+            if kind == b'd':
+                buffer += b'd '
+            buffer += ''.join([f'{literal} ' for literal in clause]).encode()
+            buffer += b'0\n'
+
+        if len(buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        self.file.write(self._buffer)
+        self._buffer.clear()
+
+    def close(self):
+        self.flush()
+        if self._owns_file:
+            self.file.close()
+
+    def __enter__(self) -> 'DRATWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_drat(filepath: str, binary: Optional[bool] = None) -> Iterator[Tuple[bool, List[int]]]:
+    """
+    A *generator* that streams the steps of a DRAT proof file (see DRATWriter) as
+    (is deletion, clause) tuples, so the proof is never loaded into memory as a whole.
+    Files compressed with gzip or xz are decompressed transparently (see load_dimacs).
+
+    e.g. a proof containing the lines ``1 -2 0`` and ``d 1 3 0`` yields
+    ``(False, [1, -2])`` then ``(True, [1, 3])``
+
+    :param filepath: The proof file to read.
+    :param binary: Whether the proof is in binary DRAT. If None, this is detected from the start of
+        the file: binary proofs begin with ``a`` or contain 0 bytes, which text proofs never do.
+    """
+
+    with _open_dimacs(filepath) as fobj:
+        if binary is None:
+            head = fobj.read(256)
+            fobj.seek(0)
+            binary = head[:1] == b'a' or b'\x00' in head
+
+        if not binary:
+            deletion = False
+            clause = list()
+            for _, text, is_special in _dimacs_sections(fobj):
+                if is_special:
+                    continue  # comments
+                # split one line at a time - splitting the whole section at once would make an
+                # object of every token in it (many times the size of the proof text)
+                for line in io.BytesIO(text):
+                    for token in line.split():
+                        if token == b'd':
+                            deletion = True
+                        elif token == b'0':
+                            yield deletion, clause
+                            deletion = False
+                            clause = list()
+                        else:
+                            clause.append(int(token))
+            return
+
+        kind = 0  # the a/d byte of the current step (0 between steps)
+        encoded = shift = 0
+        clause = list()
+        while True:
+            chunk = fobj.read(_DIMACS_CHUNK_SIZE)
+            if not chunk:
+                break
+            for byte in chunk:
+                if not kind:
+                    if byte not in b'ad':
+                        raise ValueError(f'Invalid binary DRAT step {chr(byte)!r} '
+                                         f'(expected a or d).')
+                    kind = byte
+                    continue
+                encoded |= (byte & 127) << shift
+                if byte & 128:  # more bytes of this literal follow
+                    shift += 7
+                elif encoded:
+                    clause.append(-(encoded >> 1) if encoded & 1 else encoded >> 1)
+                    encoded = shift = 0
+                else:  # a 0 byte ends the step
+                    yield kind == ord('d'), clause
+                    kind = 0
+                    clause = list()
+
+
+class DRATChecker(WatchedLiterals):
+    """
+    Checks a DRAT proof that a clause set is unsatisfiable.
+
+    Each lemma (learned clause) of the proof must be RUP (reverse unit propagation - assigning the
+    negation of its literals and propagating through the clauses so far gives a conflict) or,
+    failing that, RAT on its first literal p (every resolvent with a clause containing -p is RUP).
+    Propagation uses the watched literals inherited from WatchedLiterals, with the clauses implied
+    at level 0 kept assigned between checks.
+
+    A forward check verifies every lemma as it is read, so the proof is streamed and the space of
+    deleted clauses is reclaimed as it goes - only the clauses not yet deleted are held in memory.
+    A backward check (as in drat-trim) first adds every lemma unchecked until the empty clause is
+    reached, then works back through the proof marking the clauses each conflict actually used and
+    only checks the marked lemmas (which can still be most of them, e.g. in CDCL proofs of
+    pigeonhole formulas). This has to keep every lemma, but only once, in the arena - the steps
+    are recorded as references to it - and only recomputes the level 0 assignment when a removed
+    lemma or restored clause changes it. As in drat-trim, deleting a unit clause or
+    the reason for a level 0 assignment is ignored.
+
+    e.g. ``DRATChecker([[1, 2], [-1, 2], [1, -2], [-1, -2]]).check([(False, [1]), (False, [])])``
+    is True
+    """
+
+    def __init__(self, clause_set: Union[List[List[int]], ClauseArena]):
+        """
+        :param clause_set: The (claimed unsatisfiable) clause set. This is not modified.
+        """
+
+        super().__init__(())
+        self.units: List[int] = list()  # references to unit clauses (which are not watched)
+        self.deleted: Set[int] = set()  # references to clauses no longer in the database
+        self.marked: Set[int] = set()  # references to clauses used by a conflict (backward check)
+        self.failed_lemma: Optional[List[int]] = None  # the lemma that could not be verified
+        self._index: Dict[int, List[int]] = dict()  # _key of a clause -> references to copies
+        self._garbage = 0  # number of values in the arena taken up by deleted clauses
+        self._marking = False
+        self._conflict: Optional[int] = None  # conflicting clause once self.ok is False
+
+        for clause in clause_set:
+            self._add(clause)
+
+    def _add(self, clause: List[int]) -> Optional[int]:
+        """
+        Adds clause to the database, propagating it if it is unit at level 0.
+
+        :return: A reference to the stored clause (None for tautologies, which are dropped)
+        """
+
+        literals = list(dict.fromkeys(clause))
+        if is_tautology(literals):
+            return None
+        self.grow(max((abs(literal) for literal in literals), default=0))
+
+        # unlike _add_input_clause, literals False at level 0 are kept since a backward check
+        # later unassigns them - they are just not watched if avoidable
+        value = self.value
+        literals.sort(key=lambda literal: value[literal] == -1)
+        cref = self.arena.append(literals)
+        self.clauses.append(cref)
+        self._index.setdefault(self._key(literals), []).append(cref)
+        if len(literals) == 1:
+            self.units.append(cref)
+        elif literals:
+            self._watch(cref)
+        if self.ok:
+            self._assert(cref)
+        return cref
+
+    def _assert(self, cref: int):
+        """
+        Assigns the first literal of clause cref at level 0 if every other literal is False there
+        """
+
+        literals = self.arena.literals
+        length = literals[cref - 1]
+        if length == 0 or self.value[literals[cref]] == -1:  # (the rest are False too)
+            self.ok = False
+            self._conflict = cref
+        elif self.value[literals[cref]] == 0 and (length == 1 or
+                                                  self.value[literals[cref + 1]] == -1):
+            self.enqueue(literals[cref], cref)
+            conflict = self.propagate()
+            if conflict is not None:
+                self.ok = False
+                self._conflict = conflict
+
+    @staticmethod
+    def _key(clause: Iterable[int]) -> int:
+        """
+        :return: The same hash for every ordering of clause (without the clause itself being kept,
+            so different clauses with the same key are told apart by comparing them in the arena)
+        """
+
+        return hash(tuple(sorted(set(clause))))
+
+    def _unwatch(self, cref: int):
+        if self.arena.literals[cref - 1] >= 2:
+            self.watches[self.arena.literals[cref]].remove(cref)
+            self.watches[self.arena.literals[cref + 1]].remove(cref)
+        elif self.arena.literals[cref - 1] == 1:
+            self.units.remove(cref)
+
+    def delete(self, clause: List[int]) -> Optional[int]:
+        """
+        Removes a copy of clause from the database.
+
+        :return: A reference to the removed clause (None if the deletion was ignored)
+        """
+
+        key = self._key(clause)
+        literals = sorted(set(clause))
+        cref = next((cref for cref in reversed(self._index.get(key, ()))
+                     if sorted(self.arena.clause(cref)) == literals), None)
+        if cref is None:
+            return None  # never added (or a tautology)
+        length = self.arena.literals[cref - 1]
+        if length <= 1 or self.reason[abs(self.arena.literals[cref])] == cref:
+            return None  # unit clauses and reasons for level 0 assignments are kept
+
+        self._unindex(key, cref)
+        self._unwatch(cref)
+        self.deleted.add(cref)
+        return cref
+
+    def _unindex(self, key: int, cref: int):
+        crefs = self._index[key]
+        crefs.remove(cref)
+        if not crefs:
+            del self._index[key]
+
+    def _collect(self):
+        """
+        Copies every clause that is not deleted into a new arena (freeing the deleted ones) and
+        re-points all references to clauses at their new position, as CDCLSolver._compact_arena
+        does. Only the forward check does this, since the backward check restores deletions.
+        """
+
+        old = self.arena.literals
+        self.arena = ClauseArena()
+        moved = dict()
+        for cref in self.clauses:
+            if cref not in self.deleted:
+                moved[cref] = self.arena.append(old[cref:cref + old[cref - 1]])
+
+        self.clauses = list(moved.values())
+        self.units = [moved[cref] for cref in self.units]
+        # (the reasons of unassigned variables are stale so may be deleted clauses)
+        self.reason = [None if cref is None else moved.get(cref) for cref in self.reason]
+        self._index = {key: [moved[cref] for cref in crefs] for key, crefs in self._index.items()}
+        self.deleted.clear()
+        self._garbage = 0
+
+        # the watched literals are still the first two of each clause so watches can be rebuilt
+        for watchers in self.watches.values():
+            watchers.clear()
+        for cref in self.clauses:
+            if self.arena.literals[cref - 1] >= 2:
+                self._watch(cref)
+
+    def _reset(self):
+        """
+        Recomputes the level 0 assignment from scratch (after clauses were removed from the
+        database)
+        """
+
+        for literal in self.trail:
+            self.value[literal] = 0
+            self.value[-literal] = 0
+            self.reason[abs(literal)] = None
+        self.trail.clear()
+        self.trail_lim.clear()
+        self.qhead = 0
+        self.ok = True
+        self._conflict = None
+        for cref in self.units:  # (no watched literal is assigned now so watches stay valid)
+            if not self.ok:
+                break
+            self._assert(cref)
+
+    def _mark(self, cref: int):
+        """
+        Marks clause cref and the reasons of every assignment its literals depend on
+        """
+
+        seen = set()
+        pending = [cref]
+        while pending:
+            cref = pending.pop()
+            self.marked.add(cref)
+            for literal in self.arena.clause(cref):
+                var = abs(literal)
+                if var not in seen:
+                    seen.add(var)
+                    reason = self.reason[var]
+                    if reason is not None and reason != cref:
+                        pending.append(reason)
+
+    def is_rup(self, clause: List[int]) -> bool:
+        """
+        :return: True if assigning the negation of every literal in clause and propagating
+            results in a conflict
+        """
+
+        if not self.ok:  # everything follows from a contradiction
+            if self._marking:
+                self._mark(self._conflict)
+            return True
+
+        self.grow(max((abs(literal) for literal in clause), default=0))
+        value = self.value
+        for literal in clause:
+            if value[literal] == 1:  # already True at level 0
+                if self._marking:
+                    self._mark(self.reason[abs(literal)])
+                return True
+
+        self.new_decision_level()
+        for literal in clause:
+            if value[literal] == 0:
+                self.enqueue(-literal)
+        conflict = self.propagate()
+        if conflict is not None and self._marking:
+            self._mark(conflict)
+        self.cancel_until(0)
+        return conflict is not None
+
+    def is_rat(self, clause: List[int]) -> bool:
+        """
+        :return: True if every resolvent of clause on its first literal with a clause in the
+            database is RUP (see is_rup)
+        """
+
+        if not clause:
+            return False
+        pivot = clause[0]
+        literals = set(clause)
+        used = list()
+        for cref in self.clauses:
+            if cref in self.deleted:
+                continue
+            other = self.arena.clause(cref)
+            if -pivot not in other:
+                continue
+            resolvent = literals.union(other)
+            resolvent.discard(-pivot)
+            if not is_tautology(resolvent):
+                if not self.is_rup(list(resolvent)):
+                    return False
+                used.append(cref)
+        if self._marking:
+            self.marked.update(used)
+        return True
+
+    def check(self, steps: Iterable[Tuple[bool, List[int]]], backward: bool = True) -> bool:
+        """
+        Checks a proof given as (is deletion, clause) steps (e.g. from read_drat).
+
+        :param steps: The steps of the proof in order.
+        :param backward: If True, only checks the lemmas the refutation depends on (see above).
+            Otherwise, every lemma is checked as it is read.
+        :return: True if the proof derives the empty clause (or a level 0 conflict) and every
+            checked lemma is RUP or RAT. False otherwise, with failed_lemma set if a lemma failed.
+        """
+
+        self.failed_lemma = None
+        self._marking = False
+        # the steps applied (backward only) as references to their clauses, negated for
+        # deletions, and the first literal of each lemma (its RAT pivot, which propagation may
+        # since have moved within the arena)
+        history = array('q')
+        pivots = array('i')
+        for is_deletion, clause in steps:
+            if not self.ok:
+                break  # refuted - the rest of the proof is not needed
+            if is_deletion:
+                cref = self.delete(clause)
+                if cref is None:
+                    continue
+                elif backward:
+                    history.append(-cref)
+                    pivots.append(0)
+                else:  # the clause is never needed again so its space can be reused
+                    self._garbage += self.arena.literals[cref - 1] + 1
+                    if 2 * self._garbage > len(self.arena.literals):
+                        self._collect()
+                continue
+
+            if not backward and not (self.is_rup(clause) or self.is_rat(clause)):
+                self.failed_lemma = clause
+                return False
+            cref = self._add(clause)
+            if cref is not None and backward:
+                history.append(cref)
+                pivots.append(clause[0] if clause else 0)
+
+        if self.ok:
+            return False  # the proof never reached a contradiction
+        if not backward:
+            return True
+
+        self._marking = True
+        self._mark(self._conflict)
+        literals = self.arena.literals
+        value = self.value
+        stale = False  # whether the level 0 assignment has to be recomputed before a check
+        for cref, pivot in zip(reversed(history), reversed(pivots)):
+            if cref < 0:  # restore the clause as it was before its deletion
+                cref = -cref
+                self.deleted.discard(cref)
+                self._index.setdefault(self._key(self.arena.clause(cref)), []).append(cref)
+                self._watch(cref)
+                watched = (value[literals[cref]], value[literals[cref + 1]])
+                # (it cannot imply anything at level 0 unless one of its watches is False there)
+                stale = stale or (-1 in watched and 1 not in watched)
+                continue
+
+            clause = self.arena.clause(cref)
+            self._unindex(self._key(clause), cref)
+            self._unwatch(cref)
+            self.clauses.pop()  # (lemmas are removed in the reverse of the order they were added)
+            # the level 0 assignment (or conflict) only changes if it depended on the lemma
+            stale = stale or cref == self._conflict or any(self.reason[abs(literal)] == cref
+                                                          for literal in clause)
+            if cref in self.marked:
+                if stale:
+                    self._reset()
+                    stale = False
+                if pivot:
+                    clause.remove(pivot)
+                    clause.insert(0, pivot)
+                if not (self.is_rup(clause) or self.is_rat(clause)):
+                    self.failed_lemma = clause
+                    return False
+        return True
+
+
+def check_drat(clause_set: Union[str, List[List[int]], ClauseArena], proof_path: str,
+               binary: Optional[bool] = None, backward: bool = True) -> bool:
+    """
+    Checks the DRAT proof in proof_path that clause_set is unsatisfiable (see DRATChecker).
+
+    e.g. after ``cdcl_sat_solve(clause_set, proof=DRATWriter('proof.drat'))`` returns False (and
+    the writer is closed), ``check_drat(clause_set, 'proof.drat')`` is True
+
+    :param clause_set: The clause set or the path of a DIMACS file containing it.
+    :param proof_path: The proof file (text or binary - see read_drat).
+    :param binary: Whether the proof is binary DRAT. Detected from the file if None.
+    :param backward: If True, only lemmas the refutation depends on are checked. Otherwise, every
+        lemma is checked while the proof is streamed.
+    :return: True if the proof is a valid refutation of clause_set. False otherwise.
+    """
+
+    if isinstance(clause_set, str):
+        clause_set = load_dimacs(clause_set)
+    return DRATChecker(clause_set).check(read_drat(proof_path, binary), backward)
+
+
+# === INCREMENTAL SOLVING ===
+class Solver(CDCLSolver):
+    """
+    An incremental SAT solver for asking many related questions of the same formula.
+
+    Clauses can be added between calls to solve and each call can be made under different
+    assumptions. Since the same CDCLSolver is reused, learned clauses (which are implied by the
+    formula, so stay valid as clauses are added), VSIDS activity and saved phases all carry over
+    from one call to the next rather than each question being solved from scratch.
+
+    A clause can be made temporary by adding it with an extra "activation" literal -a and
+    assuming a in the calls it should apply to.
+
+    e.g. after ``s = Solver([[1, 2]])`` and ``s.add_clause([-1, 3])``, ``s.solve([1, -3])`` is
+    False and ``s.failed_assumptions() == [-3, 1]`` but ``s.solve([1]) == [1, 2, 3]``
+    """
+
+    def __init__(self, clause_set: Union[List[List[int]], ClauseArena] = (), **options):
+        """
+        :param clause_set: Initial clauses of the formula. This is not modified.
+        :param options: Passed on to CDCLSolver (e.g. restart_policy).
+        """
+
+        super().__init__(clause_set, **options)
+
+    def add_clause(self, clause: Iterable[int]):
+        """
+        Adds clause to the formula for every later call to solve.
+        """
+
+        clause = list(clause)
+        self.cancel_until(0)  # (solve always finishes at level 0 anyway)
+        self._occurrences.update(clause)  # so new variables start ordered by their occurrences
+        self.grow(max((abs(literal) for literal in clause), default=0))
+        if self.ok:  # once UNSAT, the formula stays UNSAT whatever is added
+            self._add_input_clause(clause)
+
+    def add_clauses(self, clause_set: Iterable[Iterable[int]]):
+        for clause in clause_set:
+            self.add_clause(clause)
+
+    def failed_assumptions(self) -> List[int]:
+        """
+        :return: If the last call to solve returned False, a subset of its assumptions which
+            cannot all be True together (empty if the formula is UNSAT without any assumptions).
+        """
+
+        return list(self.conflict_assumptions)
+
+
+# === MODEL ENUMERATION ===
+def iter_models(clause_set: Union[List[List[int]], ClauseArena],
+                projection: Optional[Iterable[int]] = None,
+                limit: Optional[int] = None) -> Iterator[List[int]]:
+    """
+    A *generator* that lazily yields every satisfying assignment of clause_set.
+
+    Each model is found by a single incremental Solver, which is then given a "blocking clause"
+    (the negation of the model) so it cannot be found again. Only the work for the models actually
+    consumed is done, so stopping after k models costs k solves rather than 2^n checks.
+
+    e.g. ``list(iter_models([[1, 2]])) == [[1, 2], [-1, 2], [1, -2]]`` (in some order)
+    and ``list(iter_models([[1, 2]], projection=[1])) == [[1], [-1]]`` (in some order)
+
+    :param clause_set: Clause set (or ClauseArena) to enumerate the models of.
+    :param projection: If given, the variables to project models onto: only their values are
+        yielded and two models which agree on them count as the same model.
+        Defaults to every variable occurring in clause_set.
+    :param limit: Maximum number of models to yield.
+    :return: An iterator over models, each a sorted list of literals over the projection.
+    """
+
+    variables = (sorted(set(abs(var) for var in projection)) if projection is not None else
+                 sorted(set(abs(literal) for clause in clause_set for literal in clause)))
+    solver = Solver(clause_set)
+    solver.grow(max(variables, default=0))  # so models also cover projected variables not used
+    count = 0
+    while limit is None or count < limit:
+        model = solver.solve()
+        if model is False:
+            return  # every model has been blocked
+        model = [model[var - 1] for var in variables]  # model[var - 1] is var or -var
+        yield model
+        count += 1
+        solver.add_clause([-literal for literal in model])  # block this model
+
+
+# === MODEL COUNTING ===
+def _connected_components(clause_set: List[Tuple[int, ...]]) -> List[List[Tuple[int, ...]]]:
+    """
+    Splits clause_set into groups of clauses that share no variables with any other group
+    (the connected components of the graph where clauses sharing a variable are adjacent),
+    using a union-find over variables.
+
+    e.g. ``_connected_components([(1, 2), (3, 4), (-2, 5)]) == [[(1, 2), (-2, 5)], [(3, 4)]]``
+    """
+
+    parent: Dict[int, int] = dict()
+
+    def find(var: int) -> int:
+        root = parent.setdefault(var, var)
+        while root != parent[root]:
+            parent[root] = parent[parent[root]]  # path halving keeps the trees shallow
+            root = parent[root]
+        return root
+
+    roots = list()
+    for clause in clause_set:
+        root = find(abs(clause[0]))
+        for literal in clause[1:]:
+            other = find(abs(literal))
+            if other != root:
+                parent[other] = root
+        roots.append(root)
+
+    components: Dict[int, List[Tuple[int, ...]]] = dict()
+    for clause, root in zip(clause_set, roots):
+        components.setdefault(find(root), []).append(clause)
+    return list(components.values())
+
+
+def _occurrences(clause_set: List[Tuple[int, ...]]) -> Dict[int, List[int]]:
+    """
+    :return: The occurrence lists of clause_set (literal -> indices of the clauses containing it)
+    """
+
+    occurs: Dict[int, List[int]] = defaultdict(list)
+    for index, clause in enumerate(clause_set):
+        for literal in clause:
+            occurs[literal].append(index)
+    return occurs
+
+
+def _propagate_units(clause_set: List[Tuple[int, ...]], assigned: Set[int],
+                     occurs: Optional[Dict[int, List[int]]] = None
+                     ) -> Optional[List[Tuple[int, ...]]]:
+    """
+    Simplifies clause_set under the literals in assigned, adding the literal of every unit clause
+    (given or formed) to assigned (so assigned is modified). Each assigned literal only visits the
+    clauses containing it or its negation, found with occurs (see _occurrences), so propagating a
+    long chain of implications costs a single pass rather than one pass per link.
+
+    :param occurs: The occurrence lists of clause_set if already known.
+    :return: The remaining clauses (each with at least 2 literals, still in the same order) or
+        None if a clause became empty (i.e. clause_set has no models extending assigned).
+    """
+
+    if occurs is None:
+        occurs = _occurrences(clause_set)
+    queue = list(assigned)  # assigned literals whose clauses have not been visited yet
+    for clause in clause_set:
+        if len(clause) == 1:
+            if -clause[0] in assigned:
+                return None
+            elif clause[0] not in assigned:
+                assigned.add(clause[0])
+                queue.append(clause[0])
+
+    satisfied: Set[int] = set()
+    unfalsified: Dict[int, int] = dict()  # index of a shortened clause -> its literals left
+    while queue:
+        literal = queue.pop()
+        satisfied.update(occurs.get(literal, ()))
+        for index in occurs.get(-literal, ()):
+            if index in satisfied:
+                continue
+            left = unfalsified.get(index, len(clause_set[index])) - 1
+            unfalsified[index] = left
+            if left == 0:
+                return None
+            elif left == 1:  # (assigned literals still in queue may already decide it)
+                free = [other for other in clause_set[index] if -other not in assigned]
+                if not free:
+                    return None
+                elif free[0] not in assigned:
+                    assigned.add(free[0])
+                    queue.append(free[0])
+
+    residual = list()
+    for index, clause in enumerate(clause_set):
+        if index in satisfied:
+            continue
+        elif index in unfalsified:
+            clause = tuple(literal for literal in clause if -literal not in assigned)
+        residual.append(clause)
+    return residual
+
+
+class _ComponentFrame:
+    """
+    A component being counted by _count_component, with the state of its branches
+    """
+
+    def __init__(self, key: Tuple, clause_set: List[Tuple[int, ...]]):
+        self.key = key
+        self.clause_set = clause_set
+        self.occurs = _occurrences(clause_set)
+        self.num_vars = len(set(abs(literal) for literal in self.occurs))
+        # branching in variable order (which follows the structure of most encodings) keeps the
+        # components that are left small and repeating, so they hit the cache. Only considering
+        # the shortest clauses keeps unit propagation effective on less structured formulas.
+        shortest = min(len(clause) for clause in clause_set)
+        var = min(abs(literal) for clause in clause_set if len(clause) == shortest
+                  for literal in clause)
+        self.literals = [-var, var]  # still to branch on (popped from the end, so var first)
+        self.total = 0  # models of the branches already counted
+        self.count: Optional[int] = None  # models of the current branch (so far)
+        self.components: List[List[Tuple[int, ...]]] = list()  # of the current branch, to count
+
+
+def _count_component(clause_set: List[Tuple[int, ...]], cache: Dict[Tuple, int]) -> int:
+    """
+    Counts the models (over its own variables) of a connected clause set with no unit clauses by
+    branching on a variable, then splitting what remains of each branch into components which can
+    be counted separately and multiplied together.
+
+    Rather than recursing once per component (and so failing on formulas, such as long chains of
+    implications, that split deeper than Python's recursion limit), this loops over an explicit
+    stack of the components being counted.
+    """
+
+    key = tuple(sorted(clause_set))  # the same component can be reached by many branches
+    if key in cache:
+        return cache[key]
+
+    stack = [_ComponentFrame(key, clause_set)]
+    while True:
+        frame = stack[-1]
+        if frame.count and frame.components:
+            component = frame.components.pop()
+            key = tuple(sorted(component))
+            if key in cache:
+                frame.count *= cache[key]
+            else:
+                stack.append(_ComponentFrame(key, component))  # multiplied in once counted
+            continue
+
+        if frame.count is not None:  # the current branch is counted
+            frame.total += frame.count
+            frame.count, frame.components = None, list()
+        if frame.literals:
+            literal = frame.literals.pop()
+            assigned = {literal}
+            residual = _propagate_units(frame.clause_set, assigned, frame.occurs)
+            if residual is not None:  # (otherwise there are no models with literal)
+                # variables that vanished without being assigned can take either value
+                remaining = set(abs(literal) for clause in residual for literal in clause)
+                frame.count = 1 << (frame.num_vars - len(assigned) - len(remaining))
+                frame.components = _connected_components(residual)
+            continue
+
+        cache[frame.key] = frame.total
+        stack.pop()
+        if not stack:
+            return frame.total
+        stack[-1].count *= frame.total
+
+
+def count_models(clause_set: Union[List[List[int]], ClauseArena],
+                 variables: Optional[Iterable[int]] = None) -> int:
+    """
+    Counts the satisfying assignments of clause_set exactly (#SAT) without enumerating them.
+
+    After unit propagation, the clause set is split into independent components (which share no
+    variables) whose counts multiply, and each is counted by branching on a variable and splitting
+    again. Component counts are cached by their (sorted) clauses, so a component reached again
+    under a different partial assignment is not recounted. Python's integers never overflow, so
+    counts of formulas with hundreds of variables are exact.
+
+    e.g. ``count_models([[1, 2], [-1, 3]]) == 4`` and ``count_models([[1, 2]], [3]) == 6``
+
+    :param clause_set: Clause set (or ClauseArena) to count the models of.
+    :param variables: Extra variables to count assignments over (each doubling the count) if they
+        do not occur in clause_set. Defaults to only the variables occurring in clause_set.
+    :return: The number of full assignments of the variables that satisfy clause_set.
+    """
+
+    clauses = _clause_tuples(clause_set)
+    if clauses is None:
+        return 0
+    all_variables = set(abs(var) for var in variables or ())
+    all_variables.update(abs(literal) for clause in clause_set for literal in clause)
+
+    assigned = set()
+    residual = _propagate_units(clauses, assigned)
+    if residual is None:
+        return 0
+
+    remaining = set(abs(literal) for clause in residual for literal in clause)
+    count = 1 << (len(all_variables) - len(assigned) - len(remaining))
+    cache: Dict[Tuple, int] = dict()
+    for component in _connected_components(residual):
+        count *= _count_component(component, cache)
+        if count == 0:
+            break
+    return count
+
+
+# === LOCAL SEARCH ===
+LOCAL_SEARCH_METHODS = ('walksat', 'probsat')
+
+
+def local_search_sat_solve(clause_set: Union[List[List[int]], ClauseArena],
+                           max_flips: int = 100000, seed: Optional[int] = None,
+                           noise: float = 0.5, method: str = 'probsat',
+                           should_stop: Optional[Callable[[], bool]] = None
+                           ) -> Union[List[int], bool, None]:
+    """
+    Searches for a satisfying assignment of clause_set by stochastic local search: starting from a
+    random full assignment, a random unsatisfied clause is repeatedly made satisfied by flipping
+    one of its variables. This is incomplete (it can never show clause_set is UNSAT) but is often
+    much faster than systematic search on large satisfiable (e.g. random 3-SAT) instances.
+
+    The variable to flip is chosen using its break count (the number of clauses that flipping it
+    would make unsatisfied) and make count (the number it would make satisfied). Both counts and
+    the set of unsatisfied clauses are updated incrementally on each flip, by only visiting the
+    clauses containing the flipped variable.
+
+    :param clause_set: Clause set (or ClauseArena) to find a satisfying assignment of.
+    :param max_flips: Number of flips to give up after.
+    :param seed: Seed for the random initial assignment and choices (for reproducible runs).
+    :param noise: For 'walksat', the probability of flipping a random variable of the clause
+        (rather than the one with the lowest break count) when every variable would break a clause.
+    :param method: One of LOCAL_SEARCH_METHODS. 'walksat' flips a variable with a break count of
+        0 if there is one and otherwise acts as described for noise. 'probsat' picks each variable
+        with probability proportional to 2.5^-break (the exponential probSAT for 3-SAT).
+    :param should_stop: Checked every 1024 flips - if it returns True, the search is abandoned.
+    :return: A full satisfying truth assignment (of the variables 1 to the largest in clause_set),
+        False if clause_set contains an empty clause or None if none was found in max_flips flips.
+    """
+
+    if method not in LOCAL_SEARCH_METHODS:
+        raise ValueError(f'Unknown method {method!r}. Expected one of {LOCAL_SEARCH_METHODS}.')
+
+    clauses = _clause_tuples(clause_set)
+    if clauses is None:
+        return False
+    num_vars = max((abs(literal) for clause in clause_set for literal in clause), default=0)
+
+    rng = random.Random(seed)
+    value = [False] + [rng.random() < 0.5 for _ in range(num_vars)]  # variable -> truth value
+    occurs: Dict[int, List[int]] = {literal: [] for var in range(1, num_vars + 1)
+                                    for literal in (var, -var)}  # literal -> clause indices
+    num_true = [0] * len(clauses)  # clause index -> number of its literals that are True
+    true_sum = [0] * len(clauses)  # sum of the variables of those (so the one, if num_true == 1)
+    break_count = [0] * (num_vars + 1)
+    make_count = [0] * (num_vars + 1)
+    unsatisfied: List[int] = list()  # clause indices (in any order so can be removed in O(1))
+    position = [-1] * len(clauses)  # clause index -> position in unsatisfied
+
+    for i, clause in enumerate(clauses):
+        for literal in clause:
+            occurs[literal].append(i)
+            if value[abs(literal)] == (literal > 0):
+                num_true[i] += 1
+                true_sum[i] += abs(literal)
+        if num_true[i] == 0:
+            position[i] = len(unsatisfied)
+            unsatisfied.append(i)
+            for literal in clause:
+                make_count[abs(literal)] += 1
+        elif num_true[i] == 1:
+            break_count[true_sum[i]] += 1  # the only True literal is critical
+
+    flips = 0
+    while unsatisfied:
+        if flips == max_flips:
+            return None  # UNKNOWN
+        if should_stop is not None and flips % 1024 == 0 and should_stop():
+            return None  # UNKNOWN
+        flips += 1
+
+        variables = [abs(literal) for literal in clauses[rng.choice(unsatisfied)]]
+        breaks = [break_count[var] for var in variables]
+        if method == 'probsat':
+            var = rng.choices(variables, [2.5 ** -b for b in breaks])[0]
+        elif 0 in breaks:
+            var = variables[breaks.index(0)]  # a "free" flip - no clause becomes unsatisfied
+        elif rng.random() < noise:
+            var = rng.choice(variables)
+        else:
+            var = min(variables, key=lambda v: (break_count[v], -make_count[v]))
+
+        value[var] = not value[var]
+        now_true = var if value[var] else -var
+        for i in occurs[now_true]:
+            num_true[i] += 1
+            true_sum[i] += var
+            if num_true[i] == 1:  # clause was unsatisfied so remove it (moving the last into place)
+                last = unsatisfied.pop()
+                if last != i:
+                    unsatisfied[position[i]] = last
+                    position[last] = position[i]
+                for literal in clauses[i]:
+                    make_count[abs(literal)] -= 1
+                break_count[var] += 1
+            elif num_true[i] == 2:  # the previously critical literal no longer is
+                break_count[true_sum[i] - var] -= 1
+
+        for i in occurs[-now_true]:
+            num_true[i] -= 1
+            true_sum[i] -= var
+            if num_true[i] == 0:
+                position[i] = len(unsatisfied)
+                unsatisfied.append(i)
+                for literal in clauses[i]:
+                    make_count[abs(literal)] += 1
+                break_count[var] -= 1
+            elif num_true[i] == 1:  # the remaining True literal is now critical
+                break_count[true_sum[i]] += 1
+
+    return [var if value[var] else -var for var in range(1, num_vars + 1)]  # SAT
+
+
+# === PARALLEL SOLVING ===
+# configurations cycled through by portfolio_sat_solve (each worker after the first also gets its
+# own seed). 'engine' picks the solver and every other key is passed to it as a keyword argument
+PORTFOLIO_CONFIGS = (
+    {'engine': 'cdcl', 'restart_policy': 'glucose'},
+    {'engine': 'cdcl', 'restart_policy': 'luby'},
+    {'engine': 'cdcl', 'restart_policy': 'none', 'decay': 0.85},
+    {'engine': 'cdcl', 'restart_policy': 'luby', 'luby_unit': 512, 'decay': 0.99},
+    {'engine': 'local_search', 'method': 'probsat', 'max_flips': 10 ** 7},  # quick on random SAT
+)
+
+_stop_event: Optional[multiprocessing.synchronize.Event] = None  # set in each worker process
+
+
+def run_engine(clause_set: Union[List[List[int]], ClauseArena], config: Dict,
+               should_stop: Optional[Callable[[], bool]] = None) -> Union[List[int], bool, None]:
+    """
+    Solves clause_set with the solver (and options) described by config (see PORTFOLIO_CONFIGS).
+
+    :param clause_set: Clause set (or ClauseArena) to solve satisfiability of.
+    :param config: 'engine' names the solver - one of ENGINES. 'assumptions' (if given) are
+        solved under and every other key is passed to the solver as a keyword argument.
+    :param should_stop: Checked regularly during the search to abandon it early.
+    :return: A satisfying assignment, False if UNSAT or None if stopped.
+    """
+
+    options = dict(config)
+    engine = options.pop('engine', 'cdcl')
+    assumptions = options.pop('assumptions', ())
+    if engine == 'cdcl':
+        return CDCLSolver(clause_set, **options).solve(assumptions, should_stop)
+    elif engine == 'dpll':  # assumptions are just dpll_sat_solve's partial_assignment
+        return dpll_sat_solve(clause_set, list(assumptions), should_stop=should_stop, **options)
+    elif engine == 'local_search':  # assumptions become unit clauses
+        clause_set = list(clause_set) + [[literal] for literal in assumptions]
+        return local_search_sat_solve(clause_set, should_stop=should_stop, **options)
+    elif engine == 'branching':
+        return branching_sat_solve(list(clause_set), list(assumptions), should_stop=should_stop,
+                                   **options)
+    elif engine == 'simple':
+        clause_set = list(clause_set) + [[literal] for literal in assumptions]
+        return simple_sat_solve(clause_set, should_stop=should_stop, **options)
+    raise ValueError(f'Unknown engine {engine!r}. Expected one of {ENGINES}.')
+
+
+ENGINES = ('cdcl', 'dpll', 'local_search', 'branching', 'simple')
+
+
+def _share_arena(arena: ClauseArena) -> shared_memory.SharedMemory:
+    """
+    Copies the offsets and literals of arena into a new block of shared memory (once) so that
+    worker processes can read it with _attach_arena instead of each being sent a pickled copy.
+    """
+
+    offsets = memoryview(arena.offsets).cast('B')
+    literals = memoryview(arena.literals).cast('B')
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(offsets) + len(literals)))
+    shm.buf[:len(offsets)] = offsets
+    shm.buf[len(offsets):len(offsets) + len(literals)] = literals
+    return shm
+
+
+def _attach_arena(name: str, num_clauses: int, num_literals: int,
+                  num_vars: int) -> Tuple[shared_memory.SharedMemory, ClauseArena]:
+    """
+    Attaches to the shared memory created by _share_arena and returns it with a read-only
+    ClauseArena reading directly from it. Its views must be released before the memory is closed.
+    """
+
+    shm = shared_memory.SharedMemory(name=name)
+    middle = 8 * num_clauses
+    arena = ClauseArena()
+    arena.offsets = shm.buf[:middle].cast('q')
+    arena.literals = shm.buf[middle:middle + 4 * num_literals].cast('i')
+    arena.num_vars = num_vars
+    return shm, arena
+
+
+def _init_worker(stop_event: multiprocessing.synchronize.Event):
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _shared_arena_worker(shared: Tuple[str, int, int, int],
+                         config: Dict) -> Union[List[int], bool, None]:
+    """
+    Runs in a worker process: solves the shared clause set with config until it is solved or
+    another worker sets the stop event.
+    """
+
+    shm, arena = _attach_arena(*shared)
+    try:
+        return run_engine(arena, config, _stop_event.is_set)
+    finally:
+        arena.offsets.release()
+        arena.literals.release()
+        shm.close()
+
+
+def _solve_shared(clause_set: Union[List[List[int]], ClauseArena], configs: List[Dict],
+                  workers: Optional[int] = None) -> Iterator[Union[List[int], bool, None]]:
+    """
+    A *generator* that solves clause_set with each of configs (see run_engine) in a pool of
+    worker processes and yields the results in the order they finish.
+
+    The clause set is placed in shared memory once rather than being pickled for every worker.
+    Closing the generator early tells the workers still running to stop and waits for them.
+
+    :param workers: Number of worker processes. Defaults to the number of CPUs.
+    """
+
+    workers = min(workers or os.cpu_count() or 1, max(1, len(configs)))
+    arena = clause_set if isinstance(clause_set, ClauseArena) else ClauseArena(clause_set)
+    shm = _share_arena(arena)
+    shared = (shm.name, len(arena), len(arena.literals), arena.num_vars)
+    stop_event = multiprocessing.Event()
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(stop_event,))
+    try:
+        futures = [executor.submit(_shared_arena_worker, shared, config) for config in configs]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        stop_event.set()  # running workers notice at their next conflict
+        executor.shutdown(wait=True, cancel_futures=True)
+        shm.close()
+        shm.unlink()
+
+
+def portfolio_sat_solve(clause_set: Union[List[List[int]], ClauseArena],
+                        workers: Optional[int] = None,
+                        configs: Optional[List[Dict]] = None) -> Union[List[int], bool, None]:
+    """
+    Solves the satisfiability of clause_set by racing differently configured solvers in separate
+    processes (a "portfolio"). The first answer found is returned and the other solvers are told
+    to stop. Since different configurations can take wildly different times on the same
+    instance, this turns idle cores into a wall-clock speedup on hard instances.
+
+    :param clause_set: Clause set (or ClauseArena) to solve satisfiability of.
+    :param workers: Number of worker processes. Defaults to the number of CPUs.
+    :param configs: Solver configurations to race (see run_engine). Defaults to cycling through
+        PORTFOLIO_CONFIGS with a different seed for every worker after the first.
+    :return: False if clause_set is not satisfiable. Otherwise, a full satisfying truth assignment.
+        None if every configuration was stopped without an answer.
+    """
+
+    if configs is None:
+        workers = workers or os.cpu_count() or 1
+        configs = [dict(PORTFOLIO_CONFIGS[i % len(PORTFOLIO_CONFIGS)]) for i in range(workers)]
+        for i, config in enumerate(configs[1:], 1):
+            config['seed'] = i
+
+    with contextlib.closing(_solve_shared(clause_set, configs, workers)) as results:
+        for result in results:
+            if result is not None:
+                return result
+    return None  # UNKNOWN
+
+
+# === CUBE AND CONQUER ===
+# solver used for each cube by cube_and_conquer_sat_solve (the cube is passed as 'assumptions')
+CONQUER_CONFIG = {'engine': 'dpll', 'heuristic': 'max_occurrence'}
+
+
+def _lookahead(engine: WatchedLiterals, literal: int) -> Optional[int]:
+    """
+    Tentatively assigns literal on a new decision level, propagates it and then backtracks.
+
+    :return: The number of literals assigned as a result (including literal itself)
+        or None if this led to a conflict (i.e. literal is a "failed literal").
+    """
+
+    level = engine.decision_level
+    engine.new_decision_level()
+    engine.enqueue(literal)
+    conflict = engine.propagate()
+    assigned = len(engine.trail) - engine.trail_lim[level]
+    engine.cancel_until(level)
+    return None if conflict is not None else assigned
+
+
+def _lookahead_branch(engine: WatchedLiterals, cube: List[int], candidates: int) -> Optional[int]:
+    """
+    Chooses the variable to split the current cube on by looking ahead on both polarities of the
+    candidates most common variables in the residual clause set. Preferring variables where *both*
+    branches propagate a lot keeps the two resulting cubes similarly easy.
+
+    Failed literals found along the way are refuted: their negation is assigned at the current
+    decision level and added to cube, since every assignment extending cube must contain it.
+
+    :return: The variable to branch on, 0 if every clause is already satisfied
+        or None if cube was refuted by propagation.
+    """
+
+    while True:
+        if engine.propagate() is not None:
+            return None
+
+        occurrences = Counter(abs(literal) for clause in engine.residual_clauses()
+                              for literal in clause)
+        if not occurrences:
+            return 0
+
+        best_var, best_score = 0, -1
+        for var, _ in occurrences.most_common(candidates):
+            positive = _lookahead(engine, var)
+            negative = _lookahead(engine, -var)
+            if positive is None or negative is None:
+                break
+            score = 1024 * positive * negative + positive + negative  # as in march's cuber
+            if score > best_score:
+                best_var, best_score = var, score
+        else:
+            return best_var
+
+        if positive is None and negative is None:
+            return None  # both polarities fail so cube itself is unsatisfiable
+        forced = -var if positive is None else var
+        engine.enqueue(forced)
+        cube.append(forced)  # then rescore since the residual clause set has changed
+
+
+def cube_clause_set(clause_set: Union[List[List[int]], ClauseArena], num_cubes: int = 64,
+                    candidates: int = 32) -> List[List[int]]:
+    """
+    Splits the search space of clause_set into at most num_cubes "cubes" (conjunctions of
+    literals) by repeatedly branching on the variable chosen by lookahead (see _lookahead_branch).
+    Every satisfying assignment of clause_set extends one of the cubes, and cubes already refuted
+    by propagation are left out, so clause_set is unsatisfiable if every cube is.
+
+    e.g. ``cube_clause_set([[1, 2], [-1, 2], [1, -2]], 2) == [[1]]`` since 1 is forced (-1 fails)
+    and then every clause is satisfied
+
+    :param clause_set: Clause set (or ClauseArena) to split. This is not modified.
+    :param num_cubes: Maximum number of cubes to produce. Each split shares its branch's
+        allowance between its two sides (the second also gets whatever the first did not use), so
+        the split is balanced - 64 cubes are 6 decisions deep - and stops early in branches where
+        every clause is satisfied.
+    :param candidates: Number of variables (the most common first) to look ahead on at each split.
+    :return: A list of cubes, each a list of literals. Empty if clause_set is unsatisfiable.
+    """
+
+    engine = WatchedLiterals(clause_set)
+    if not engine.ok:
+        return []
+
+    cubes = list()
+
+    def split(cube: List[int], allowance: int):
+        var = _lookahead_branch(engine, cube, candidates)
+        if var is None:  # refuted so no cube needs to be solved here
+            return
+        if var == 0 or allowance == 1:
+            cubes.append(cube)
+            return
+
+        level = engine.decision_level
+        for literal in [var, -var]:
+            engine.new_decision_level()
+            engine.enqueue(literal)
+            produced = len(cubes)
+            split(cube + [literal], (allowance + 1) // 2 if literal == var else allowance)
+            allowance -= len(cubes) - produced
+            engine.cancel_until(level)
+
+    split([], max(1, num_cubes))
+    return cubes
+
+
+def cube_and_conquer_sat_solve(clause_set: Union[List[List[int]], ClauseArena],
+                               num_cubes: int = 64, workers: Optional[int] = None,
+                               config: Optional[Dict] = None) -> Union[List[int], bool, None]:
+    """
+    Solves the satisfiability of clause_set by splitting it into cubes with cube_clause_set and
+    then solving clause_set under each cube (as its partial assignment) in a pool of worker
+    processes. Unlike portfolio_sat_solve, the work itself is divided between the workers,
+    so this also speeds up proving unsatisfiability.
+
+    :param clause_set: Clause set (or ClauseArena) to solve satisfiability of.
+    :param num_cubes: Maximum number of cubes to split clause_set into. More cubes than workers
+        balances the load better since some cubes are much harder than others.
+    :param workers: Number of worker processes. Defaults to the number of CPUs.
+    :param config: Solver used for each cube (see run_engine). Defaults to CONQUER_CONFIG.
+    :return: False if clause_set is not satisfiable. Otherwise, the satisfying assignment
+        found for the first satisfiable cube. None if some cube could not be solved.
+    """
+
+    cubes = cube_clause_set(clause_set, num_cubes)
+    if not cubes:
+        return False  # UNSAT - every cube was refuted while splitting
+
+    config = CONQUER_CONFIG if config is None else config
+    configs = [dict(config, assumptions=cube) for cube in cubes]
+    unknown = False
+    with contextlib.closing(_solve_shared(clause_set, configs, workers)) as results:
+        for result in results:
+            if isinstance(result, list):  # (an empty list is still SAT)
+                return result  # SAT - the remaining cubes do not need solving
+            unknown = unknown or result is None
+    return None if unknown else False  # UNSAT only if every cube was refuted
+
+
+# === PREPROCESSING ===
+class Preprocessor:
+    """
+    Simplifies a clause set before search while preserving its satisfiability, using
+    occurrence lists (literal -> clauses containing it) so each technique only visits the
+    clauses that share a literal with the clause or variable it is working on:
+
+    - unit propagation: clauses satisfied by a unit are deleted and falsified literals removed
+    - subsumption: a clause that contains every literal of another clause is redundant
+    - self-subsuming resolution: if C = A + [x] and D = A + B + [-x] then D can drop -x
+    - bounded variable elimination (BVE): a variable is replaced by every (non-tautological)
+      resolvent of the clauses containing it, if this does not increase the number of clauses
+    - failed literal probing: if propagating a literal leads to a conflict, its negation is a unit
+
+    Variable elimination does not preserve equivalence, so the clauses removed by it are
+    recorded on stack to extend a model of the simplified clause set to the original one
+    (see extend_model).
+
+    e.g. ``Preprocessor([[1, 2], [1, 2, 3], [-1, 2]]).run() == [[2]]``
+    """
+
+    def __init__(self, clause_set: Union[List[List[int]], ClauseArena], resolvent_limit: int = 20):
+        """
+        :param clause_set: List of clauses (or ClauseArena) to simplify. This is not modified.
+        :param resolvent_limit: Variables with a resolvent longer than this are not eliminated.
+        """
+
+        self.resolvent_limit = resolvent_limit
+        self.clauses: List[Optional[Set[int]]] = list()  # None once a clause is deleted
+        self.occurs: Dict[int, Set[int]] = defaultdict(set)  # literal -> indices into clauses
+        self.assigned: Set[int] = set()  # literals fixed to be True (units)
+        self.eliminated: Set[int] = set()  # variables removed by BVE
+        self.stack: List[Tuple[int, List[int]]] = list()  # (witness literal, removed clause)
+        self.ok = True  # becomes False once the clause set is shown to be UNSAT
+
+        self._units: List[int] = list()  # assigned literals still to be propagated
+        self._touched: Set[int] = set()  # clauses added or strengthened since last subsumption
+        self._forward: Set[int] = set()  # touched clauses an older clause might subsume
+        for clause in clause_set:
+            self._add(clause)
+        self._forward.clear()  # (every pair of input clauses is checked by backward subsumption)
+
+    def _add(self, clause: Iterable[int]):
+        clause = set(clause)
+        if is_tautology(clause):
+            return  # tautologies are always satisfied
+        if any(literal in self.assigned for literal in clause):
+            return  # already satisfied by a unit
+        clause.difference_update([-literal for literal in self.assigned])
+
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._assign(next(iter(clause)))
+        else:
+            cid = len(self.clauses)
+            self.clauses.append(clause)
+            for literal in clause:
+                self.occurs[literal].add(cid)
+            self._touched.add(cid)
+            self._forward.add(cid)
+
+    def _remove(self, cid: int):
+        for literal in self.clauses[cid]:
+            self.occurs[literal].discard(cid)
+        self.clauses[cid] = None
+
+    def _strengthen(self, cid: int, literal: int):
+        """
+        Removes literal from the clause with index cid (since it is False or redundant there)
+        """
+
+        clause = self.clauses[cid]
+        clause.discard(literal)
+        self.occurs[literal].discard(cid)
+        if len(clause) == 1:
+            self._assign(next(iter(clause)))
+            self._remove(cid)
+        else:
+            self._touched.add(cid)
+            self._forward.add(cid)
+
+    def _assign(self, literal: int):
+        if -literal in self.assigned:
+            self.ok = False
+        elif literal not in self.assigned:
+            self.assigned.add(literal)
+            self._units.append(literal)
+
+    def _propagate(self):
+        while self._units and self.ok:
+            literal = self._units.pop()
+            for cid in list(self.occurs[literal]):
+                self._remove(cid)  # satisfied
+            for cid in list(self.occurs[-literal]):
+                self._strengthen(cid, -literal)  # -literal is False
+
+    def _subsume_forward(self, cid: int):
+        """
+        Applies subsumption and self-subsuming resolution with every other clause D against
+        the clause C with index cid, so C is deleted if some D subsumes it and strengthened if
+        some D = A + [-x] with A in C has x in C. Any such D (other than units, which are
+        already propagated) contains a literal of C but not necessarily the rarest, so the
+        clauses containing every literal of C are checked.
+        """
+
+        clause = self.clauses[cid]
+        checked = {cid}
+        for literal in list(clause):
+            for other in list(self.occurs[literal]):
+                other_clause = self.clauses[other]
+                if other in checked or other_clause is None or len(other_clause) > len(clause):
+                    continue
+                checked.add(other)
+                missing = other_clause - clause
+                if not missing:
+                    self._remove(cid)  # subsumed
+                    return
+                elif len(missing) == 1:
+                    negated = next(iter(missing))
+                    if -negated in clause:  # other resolved with clause on it subsumes clause
+                        self._strengthen(cid, -negated)
+                        if self.clauses[cid] is None:
+                            return  # became a unit
+                if literal not in clause:
+                    break  # literal itself was removed above
+
+    def _subsume(self):
+        """
+        Applies subsumption and self-subsuming resolution with every touched clause C against
+        every other clause D, in both directions (see _subsume_forward) unless C is an input
+        clause, which the other input clauses are all checked against anyway. When C is the
+        smaller clause, only the clauses containing the variable of C with the fewest occurrences
+        need to be checked, since any D it applies to must contain that variable.
+        """
+
+        while self._touched and self.ok:
+            cid = self._touched.pop()
+            forward = cid in self._forward
+            self._forward.discard(cid)
+            if self.clauses[cid] is None:
+                continue
+            if forward:
+                self._subsume_forward(cid)
+            clause = self.clauses[cid]
+            if clause is None:
+                self._propagate()
+                continue
+
+            best = min(clause, key=lambda lit: len(self.occurs[lit]) + len(self.occurs[-lit]))
+            for other in list(self.occurs[best]) + list(self.occurs[-best]):
+                other_clause = self.clauses[other]
+                if other == cid or other_clause is None or len(other_clause) < len(clause):
+                    continue
+                missing = clause - other_clause
+                if not missing:
+                    self._remove(other)  # subsumed
+                elif len(missing) == 1:
+                    literal = next(iter(missing))
+                    if -literal in other_clause:  # (clause - literal) + [-literal] subsumes other
+                        self._strengthen(other, -literal)
+                if self.clauses[cid] is None:
+                    break  # clause itself was deleted by a unit found above
+
+            self._propagate()
+
+    def _eliminate(self):
+        """
+        Applies bounded variable elimination to every variable, cheapest (fewest possible
+        resolvents) first.
+        """
+
+        variables = set(abs(literal) for literal, cids in self.occurs.items() if cids)
+        for var in sorted(variables, key=lambda v: len(self.occurs[v]) * len(self.occurs[-v])):
+            if not self.ok:
+                return
+            if var in self.eliminated or var in self.assigned or -var in self.assigned:
+                continue
+
+            positive = [self.clauses[cid] for cid in self.occurs[var]]
+            negative = [self.clauses[cid] for cid in self.occurs[-var]]
+            if not positive and not negative:
+                continue  # var no longer occurs (e.g. every clause it was in was subsumed)
+            resolvents = list()
+            for p in positive:
+                for n in negative:
+                    resolvent = (p | n) - {var, -var}
+                    if is_tautology(resolvent):
+                        continue
+                    if (len(resolvent) > self.resolvent_limit or
+                            len(resolvents) == len(positive) + len(negative)):
+                        break  # eliminating var would make the clause set (or a clause) grow
+                    resolvents.append(resolvent)
+                else:
+                    continue
+                break
+            else:
+                # only one side needs to be kept to extend a model: -witness is assigned first
+                # and witness flipped to True if any of its clauses is unsatisfied
+                witness = var if len(positive) <= len(negative) else -var
+                for cid in list(self.occurs[witness]):
+                    self.stack.append((witness, sort_literals(self.clauses[cid])))
+                self.stack.append((-witness, [-witness]))
+                for cid in list(self.occurs[var]) + list(self.occurs[-var]):
+                    self._remove(cid)
+                self.eliminated.add(var)
+                for resolvent in resolvents:
+                    self._add(resolvent)
+                self._propagate()
+
+    def _probe(self):
+        """
+        Looks ahead on both polarities of every remaining variable to find failed literals.
+        """
+
+        engine = WatchedLiterals(self.clause_set())
+        if not engine.ok or engine.propagate() is not None:
+            self.ok = False
+            return
+
+        for var in range(1, engine.num_vars + 1):
+            if engine.value[var] != 0:
+                continue
+            for literal in [var, -var]:
+                if _lookahead(engine, literal) is None:  # failed so -literal is implied
+                    engine.enqueue(-literal)
+                    if engine.propagate() is not None:
+                        self.ok = False  # both polarities fail
+                        return
+                    break
+
+        for literal in engine.trail:  # including the units implied by the failed literals
+            self._assign(literal)
+        self._propagate()
+
+    def run(self, eliminate: bool = True, probe: bool = True, rounds: int = 3) -> List[List[int]]:
+        """
+        Simplifies the clause set until nothing changes (or for at most rounds rounds).
+
+        :param eliminate: Whether to apply bounded variable elimination.
+        :param probe: Whether to apply failed literal probing.
+        :param rounds: Maximum number of times to apply every technique.
+        :return: The simplified clause set (see clause_set).
+        """
+
+        for _ in range(rounds):
+            size = (len(self.assigned), len(self.eliminated),
+                    sum(len(clause) for clause in self.clauses if clause is not None))
+            self._propagate()
+            self._subsume()
+            if eliminate and self.ok:
+                self._eliminate()
+                self._subsume()
+            if probe and self.ok:
+                self._probe()
+                self._subsume()
+            if not self.ok or size == (len(self.assigned), len(self.eliminated),
+                                       sum(len(c) for c in self.clauses if c is not None)):
+                break
+
+        return self.clause_set()
+
+    def clause_set(self) -> List[List[int]]:
+        """
+        :return: The current clause set, with every unit as a clause of its own
+            (or [[]] if the clause set was shown to be UNSAT).
+        """
+
+        if not self.ok:
+            return [[]]
+        return ([[literal] for literal in sort_literals(self.assigned)] +
+                [sort_literals(clause) for clause in self.clauses if clause is not None])
+
+
+def extend_model(assignment: List[int], stack: List[Tuple[int, List[int]]]) -> List[int]:
+    """
+    Extends a satisfying assignment of a preprocessed clause set to one of the original clause
+    set by going back through the clauses removed by variable elimination (latest first) and
+    setting the witness literal of any clause that is not yet satisfied to True.
+
+    :param assignment: A satisfying assignment of the clause set returned by preprocess.
+    :param stack: The reconstruction stack returned alongside it by preprocess.
+    :return: The extended satisfying assignment.
+    """
+
+    true_literals = set(assignment)
+    # witnesses are only chosen correctly for a full assignment, so first make False any variable
+    # that assignment leaves unassigned (e.g. one that became irrelevant in dpll_sat_solve)
+    for _, clause in stack:
+        for literal in clause:
+            if literal not in true_literals and -literal not in true_literals:
+                true_literals.add(-abs(literal))
+
+    for witness, clause in reversed(stack):
+        if not any(literal in true_literals for literal in clause):
+            true_literals.discard(-witness)
+            true_literals.add(witness)
+    return sort_literals(true_literals)
+
+
+def preprocess(clause_set: Union[List[List[int]], ClauseArena], eliminate: bool = True,
+               probe: bool = True) -> Tuple[List[List[int]], List[Tuple[int, List[int]]]]:
+    """
+    Simplifies clause_set with subsumption, self-subsuming resolution, bounded variable
+    elimination and failed literal probing (see Preprocessor).
+
+    e.g. ``preprocess([[1, 2], [-1, 3]]) == ([], [(2, [2]), (3, [3])])`` since 2 and 3 are pure
+    (so can be eliminated without any resolvents) and then ``extend_model([], stack) == [2, 3]``
+
+    :param clause_set: Clause set (or ClauseArena) to simplify. This is not modified.
+    :param eliminate: Whether to apply bounded variable elimination.
+    :param probe: Whether to apply failed literal probing.
+    :return: The simplified clause set (which is satisfiable iff clause_set is) and the stack
+        needed by extend_model to turn its satisfying assignments into ones of clause_set.
+    """
+
+    preprocessor = Preprocessor(clause_set)
+    return preprocessor.run(eliminate, probe), preprocessor.stack
+
+
+def preprocessed_sat_solve(clause_set: Union[List[List[int]], ClauseArena],
+                           solver: Callable = cdcl_sat_solve) -> Union[List[int], bool, None]:
+    """
+    Solves the satisfiability of clause_set by preprocessing it and solving the (smaller)
+    simplified clause set with solver (called with the clause set and an empty assignment,
+    e.g. dpll_sat_solve or cdcl_sat_solve).
+
+    :return: False if clause_set is not satisfiable. Otherwise, a satisfying truth assignment
+        of clause_set (variables that became irrelevant may be left unassigned).
+    """
+
+    simplified, stack = preprocess(clause_set)
+    result = solver(simplified, [])
+    if result is False or result is None:
+        return result
+    return extend_model(result, stack)
+
+
+# === RESULT CACHE ===
+def formula_hash(clause_set: Union[List[List[int]], ClauseArena],
+                 assumptions: Iterable[int] = ()) -> str:
+    """
+    Hashes clause_set in a canonical form, so formulas that only differ in the order of their
+    clauses or of the literals within them (or in repeated literals and clauses) hash the same.
+    Solving under assumptions is solving with them as unit clauses, so they are hashed as such.
+
+    e.g. ``formula_hash([[2, 1], [-3]]) == formula_hash([[-3], [1, 2, 1], [-3]])`` and
+    ``formula_hash([[1, 2]], [-3]) == formula_hash([[1, 2], [-3]])``
+
+    :return: The SHA-256 hex digest of the sorted, de-duplicated clauses.
+    """
+
+    literals = array('i')
+    clauses = chain(clause_set, ([literal] for literal in assumptions))
+    for clause in sorted(set(tuple(sorted(set(clause))) for clause in clauses)):
+        literals.extend(clause)
+        literals.append(0)
+    if sys.byteorder == 'big':  # so hashes are the same on every machine
+        literals.byteswap()
+    return hashlib.sha256(literals).hexdigest()
+
+
+class ResultCache:
+    """
+    A persistent cache of solver results (models, or False for UNSAT) in an SQLite database,
+    keyed by formula_hash. Once the stored results take up more than max_size bytes, the least
+    recently used ones are evicted. Several processes can share the same database file.
+
+    e.g. after ``cache = ResultCache('results.db')`` and ``cache.put(formula_hash(f), model)``,
+    ``cache.get(formula_hash(f)) == model`` (even in a later run)
+    """
+
+    def __init__(self, filepath: str, max_size: int = 64 << 20):
+        """
+        :param filepath: Path of the database file (created if it does not exist).
+        :param max_size: Maximum number of bytes of keys and models to keep.
+        """
+
+        self.max_size = max_size
+        self.connection = sqlite3.connect(filepath, timeout=60)
+        with self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, '
+                                    'model TEXT, size INTEGER NOT NULL, '
+                                    'last_used INTEGER NOT NULL)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS results_by_last_used '
+                                    'ON results (last_used)')
+            # the total size of the results, kept up to date by put so it never has to sum them
+            self.connection.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, '
+                                    'value INTEGER NOT NULL)')
+            self.connection.execute("INSERT OR IGNORE INTO meta SELECT 'size', "
+                                    'COALESCE(SUM(size), 0) FROM results')
+
+    def get(self, key: str) -> Union[List[int], bool, None]:
+        """
+        :return: The cached result for key (a model or False if UNSAT) or None if it is not cached
+        """
+
+        with self.connection:
+            row = self.connection.execute('SELECT model FROM results WHERE key = ?',
+                                          (key,)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute('UPDATE results SET last_used = ? WHERE key = ?',
+                                    (time.time_ns(), key))
+        return False if row[0] is None else json.loads(row[0])
+
+    def put(self, key: str, result: Union[List[int], bool, None]):
+        """
+        Stores result (a model or False if UNSAT) for key, evicting the least recently used
+        results if the cache is now over max_size. None (UNKNOWN) results are not stored since
+        they depend on the budget the solver was given.
+        """
+
+        if result is None:
+            return
+        model = None if result is False else json.dumps(list(result), separators=(',', ':'))
+        size = len(key) + (0 if model is None else len(model))
+        with self.connection:
+            # (a write comes first so the transaction holds the write lock before anything is read)
+            self.connection.execute("UPDATE meta SET value = value + ? - COALESCE((SELECT size "
+                                    "FROM results WHERE key = ?), 0) WHERE name = 'size'",
+                                    (size, key))
+            self.connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                                    (key, model, size, time.time_ns()))
+            excess = self.connection.execute("SELECT value FROM meta WHERE name = 'size'"
+                                             ).fetchone()[0] - self.max_size
+            if excess > 0:
+                evicted = list()
+                freed = 0
+                for old_key, old_size in self.connection.execute(
+                        'SELECT key, size FROM results ORDER BY last_used'):
+                    if freed >= excess:
+                        break
+                    evicted.append((old_key,))
+                    freed += old_size
+                self.connection.executemany('DELETE FROM results WHERE key = ?', evicted)
+                self.connection.execute("UPDATE meta SET value = value - ? WHERE name = 'size'",
+                                        (freed,))
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> 'ResultCache':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def cached_sat_solve(clause_set: Union[List[List[int]], ClauseArena],
+                     cache: Union[str, ResultCache], solver: Callable = dpll_sat_solve,
+                     assumptions: List[int] = ()) -> Union[List[int], bool, None]:
+    """
+    Solves the satisfiability of clause_set with solver (called with the clause set and
+    assumptions as its partial assignment, as in preprocessed_sat_solve) unless its result is
+    already in cache, in which case it only costs hashing clause_set. New results are added to the
+    cache.
+
+    :param cache: A ResultCache or the path of its database.
+    :param assumptions: Literals to solve under (part of the cache key).
+    :return: False if clause_set is not satisfiable. Otherwise, a satisfying truth assignment.
+        None if solver stopped without an answer.
+    """
+
+    if isinstance(cache, str):
+        with ResultCache(cache) as opened:
+            return cached_sat_solve(clause_set, opened, solver, assumptions)
+
+    key = formula_hash(clause_set, assumptions)
+    result = cache.get(key)
+    if result is None:
+        result = solver(clause_set, list(assumptions))
+        cache.put(key, result)
+    return result
+
+
+# === BATCH SOLVING ===
+def _job_should_stop(stats: SolverStats, deadline: Optional[float],
+                     max_conflicts: Optional[int]) -> Callable[[], bool]:
+    """
+    :param deadline: The time.perf_counter() value at which the job runs out of time.
+    :return: A should_stop callback (checked by the solvers after every conflict) which is True
+        once the deadline has passed, max_conflicts conflicts have been counted in stats or the
+        worker pool is being shut down
+    """
+
+    def should_stop() -> bool:
+        return ((deadline is not None and time.perf_counter() >= deadline) or
+                (max_conflicts is not None and stats['conflicts'] >= max_conflicts) or
+                (_stop_event is not None and _stop_event.is_set()))
+
+    return should_stop
+
+
+def _solve_job(job: int, source: Union[str, List[List[int]], ClauseArena], config: Dict,
+               timeout: Optional[float], max_conflicts: Optional[int],
+               cache_path: Optional[str] = None) -> Dict:
+    """
+    Runs in a worker process: loads (if source is a path) and solves one job of solve_many,
+    looking its result up in (and then adding it to) the ResultCache at cache_path if given.
+    """
+
+    start = time.perf_counter()
+    deadline = None if timeout is None else start + timeout  # (so loading counts towards it)
+    stats = SolverStats()
+    result = {'job': job, 'source': source if isinstance(source, str) else None}
+    try:
+        with stats.phase('load'):
+            clause_set = load_dimacs(source) if isinstance(source, str) else source
+        options = dict(config)
+        if options.get('engine', 'cdcl') in ('cdcl', 'dpll'):
+            options['stats'] = stats
+        if cache_path is None:
+            model = run_engine(clause_set, options,
+                               _job_should_stop(stats, deadline, max_conflicts))
+        else:
+            with ResultCache(cache_path) as cache:
+                key = formula_hash(clause_set, config.get('assumptions', ()))
+                model = cache.get(key)
+                result['cached'] = model is not None
+                if model is None:
+                    model = run_engine(clause_set, options,
+                                       _job_should_stop(stats, deadline, max_conflicts))
+                    cache.put(key, model)
+    except Exception as error:  # (e.g. a missing or malformed file - load_dimacs raises Exception)
+        result.update({'status': 'ERROR', 'error': str(error), 'model': None})
+    else:
+        result.update({'status': 'UNKNOWN' if model is None else 'UNSAT' if model is False
+                       else 'SAT', 'model': model if isinstance(model, list) else None})
+    result.update({'time': time.perf_counter() - start, 'stats': stats.to_dict()})
+    return result
+
+
+def solve_many(paths_or_clause_sets: Iterable[Union[str, List[List[int]], ClauseArena]],
+               workers: Optional[int] = None, timeout: Optional[float] = None,
+               max_conflicts: Optional[int] = None, config: Optional[Dict] = None,
+               cache: Optional[str] = None) -> Iterator[Dict]:
+    """
+    A *generator* that solves many independent instances in one persistent pool of worker
+    processes and yields a result for each as soon as it finishes (so not necessarily in order).
+
+    Jobs are streamed into the pool - only a couple per worker are queued at a time - so
+    paths_or_clause_sets can be a lazy iterable of any length. Each job's budget is enforced
+    cooperatively by the solver's should_stop check, so a job that runs out of time or conflicts
+    is reported as UNKNOWN rather than killing its worker. Closing the generator early stops the
+    running jobs and waits for the workers to exit.
+
+    e.g. ``for result in solve_many(['uf50-01.cnf', 'uuf50-01.cnf'], timeout=10):
+    print(json.dumps(result))`` prints one JSON line per file
+
+    :param paths_or_clause_sets: DIMACS file paths (loaded by the workers) and/or clause sets.
+    :param workers: Number of worker processes. Defaults to the number of CPUs.
+    :param timeout: Maximum number of seconds to spend on each job (including loading it).
+    :param max_conflicts: Maximum number of conflicts for each job (cdcl and dpll engines only).
+    :param config: Solver configuration for every job (see run_engine). Defaults to CDCL.
+    :param cache: If given, the path of a ResultCache database shared by the workers. A job whose
+        formula is already in it is answered from the cache instead of being solved.
+    :return: A dict for each job with its index in paths_or_clause_sets as 'job', its 'source'
+        path (None for clause sets), 'status' ('SAT', 'UNSAT', 'UNKNOWN' or 'ERROR' along with
+        the 'error' message), the satisfying 'model' (None unless SAT), the 'time' in seconds and
+        'stats' (see SolverStats). If cache is given, 'cached' is whether it was a cache hit.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    config = {'engine': 'cdcl'} if config is None else config
+    stop_event = multiprocessing.Event()
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(stop_event,))
+    pending = set()
+    try:
+        for job, source in enumerate(paths_or_clause_sets):
+            if len(pending) >= 2 * workers:  # keep every worker busy without queueing every job
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield future.result()
+            pending.add(executor.submit(_solve_job, job, source, config, timeout, max_conflicts,
+                                        cache))
+        for future in as_completed(pending):
+            yield future.result()
+    finally:
+        stop_event.set()  # (only has an effect if the generator was closed early)
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+# === COMPONENT DECOMPOSITION ===
+def decomposed_sat_solve(clause_set: Union[List[List[int]], ClauseArena],
+                         workers: Optional[int] = 1,
+                         config: Optional[Dict] = None) -> Union[List[int], bool, None]:
+    """
+    Solves the satisfiability of clause_set by simplifying it at the top level (with unit
+    propagation and pure literal elimination, until neither applies - simplifying only ever splits
+    components further, so splitting once afterwards finds the same components as re-splitting
+    after every round would), splitting what remains into
+    independent components (groups of clauses sharing no variables - see _connected_components)
+    and solving each component separately before merging their models.
+
+    Searching the whole clause set at once, a conflict in one component can undo decisions made in
+    another, so the search trees of the components multiply. Solved separately, a clause set made
+    of disconnected parts instead costs the sum of its parts.
+
+    e.g. ``decomposed_sat_solve([[1, 2], [-1, -2], [3, 4], [-3, -4]])`` solves [[1, 2], [-1, -2]]
+    and [[3, 4], [-3, -4]] separately
+
+    :param clause_set: Clause set (or ClauseArena) to solve satisfiability of.
+    :param workers: Number of worker processes to solve components in (see solve_many). If 1, they
+        are solved one at a time in this process instead. None uses the number of CPUs.
+    :param config: Solver used for each component (see run_engine). Defaults to CONQUER_CONFIG.
+    :return: False if clause_set is not satisfiable (as soon as any component is found to be UNSAT).
+        Otherwise, a satisfying truth assignment (variables that became irrelevant may be left
+        unassigned). None if some component could not be solved.
+    """
+
+    clauses = _clause_tuples(clause_set)
+    if clauses is None:
+        return False
+
+    assigned = set()
+    while True:
+        clauses = _propagate_units(clauses, assigned)
+        if clauses is None:
+            return False  # UNSAT
+        literals = set(literal for clause in clauses for literal in clause)
+        pure_literals = [literal for literal in literals if -literal not in literals]
+        if not pure_literals:
+            break
+        assigned.update(pure_literals)
+
+    # (largest first, so the hardest components are started first when solved in parallel)
+    components = sorted(([list(clause) for clause in component]
+                         for component in _connected_components(clauses)),
+                        key=len, reverse=True)
+    config = CONQUER_CONFIG if config is None else config
+    model = list(assigned)
+    unknown = False
+
+    def merge(component: List[List[int]], result: List[int]):
+        # engines such as cdcl assign every variable up to the largest in component, but the
+        # ones that do not occur in it belong to (and are assigned by) other components
+        variables = set(abs(literal) for clause in component for literal in clause)
+        model.extend(literal for literal in result if abs(literal) in variables)
+
+    if workers == 1 or len(components) <= 1:
+        for component in components:
+            result = run_engine(component, config)
+            if result is False:
+                return False  # UNSAT - the remaining components do not need solving
+            elif result is None:
+                unknown = True
+            else:
+                merge(component, result)
+    else:
+        with contextlib.closing(solve_many(components, workers, config=config)) as results:
+            for result in results:
+                if result['status'] == 'UNSAT':
+                    return False
+                elif result['status'] == 'SAT':
+                    merge(components[result['job']], result['model'])
+                else:
+                    unknown = True
+    return None if unknown else sort_literals(model)
+
+
+# === BENCHMARKING ===
+def random_ksat(num_vars: int, num_clauses: int, k: int = 3,
+                seed: Optional[int] = None) -> List[List[int]]:
+    """
+    Generates a uniform random k-SAT clause set, in which each clause contains k distinct
+    variables each negated with probability 1/2. For 3-SAT, instances with about 4.26 clauses per
+    variable are the hardest and roughly half of them are satisfiable (cf. the SATLIB uf/uuf sets).
+
+    e.g. ``random_ksat(50, 213, seed=1)`` is a (reproducible) instance like uf50-01.cnf
+
+    :param num_vars: Number of variables to choose from.
+    :param num_clauses: Number of clauses to generate.
+    :param k: Number of literals in each clause.
+    :param seed: Seed for the random number generator, so instances can be regenerated.
+    :return: The generated clause set.
+    """
+
+    if not 0 < k <= num_vars:
+        raise ValueError(f'Cannot choose {k} distinct variables out of {num_vars}.')
+
+    rng = random.Random(seed)
+    variables = range(1, num_vars + 1)
+    return [[var if rng.random() < 0.5 else -var for var in rng.sample(variables, k)]
+            for _ in range(num_clauses)]
+
+
+def pigeonhole(holes: int) -> List[List[int]]:
+    """
+    Generates the pigeonhole principle for holes + 1 pigeons and holes holes - every pigeon is in
+    some hole but no two pigeons share a hole - which is UNSAT but needs exponentially long
+    resolution proofs, so is hard for every solver here (cf. hole6 (UNSAT).txt).
+    Variable p * holes + h + 1 means that pigeon p is in hole h.
+
+    e.g. ``pigeonhole(1) == [[1], [2], [-1, -2]]``
+
+    :param holes: Number of holes.
+    :return: The generated clause set.
+    """
+
+    pigeons = holes + 1
+    clause_set = [[p * holes + h + 1 for h in range(holes)] for p in range(pigeons)]
+    for h in range(holes):
+        for p in range(pigeons):
+            for q in range(p + 1, pigeons):
+                clause_set.append([-(p * holes + h + 1), -(q * holes + h + 1)])
+    return clause_set
+
+
+def save_dimacs(clause_set: Union[List[List[int]], ClauseArena], filepath: str,
+                comments: Iterable[str] = ()):
+    """
+    Writes clause_set to filepath in DIMACS format (which load_dimacs reads back)
+
+    :param comments: Lines to write as comments before the header.
+    """
+
+    clause_set = list(clause_set)
+    num_vars = max((abs(literal) for clause in clause_set for literal in clause), default=0)
+    with open(filepath, 'w') as fobj:
+        for comment in comments:
+            fobj.write(f'c {comment}\n')
+        fobj.write(f'p cnf {num_vars} {len(clause_set)}\n')
+        for clause in clause_set:
+            fobj.write(''.join([f'{literal} ' for literal in clause]) + '0\n')
+
+
+def benchmark_corpus(directory: Optional[str] = None,
+                     seed: int = 0) -> List[Tuple[str, List[List[int]]]]:
+    """
+    The instances run_benchmarks solves by default.
+
+    :param directory: If given, every file in it is loaded as a DIMACS file (e.g. the
+        'Sample SAT tests' used by the testing code below). Otherwise, a corpus is generated so
+        benchmarks can be run anywhere: two random 3-SAT instances with 4.26 clauses per variable
+        for each of 20, 50, 75 and 100 variables (named like the SATLIB uf instances) and the
+        pigeonhole instances with 4, 5 and 6 holes.
+    :param seed: Changes which random instances are generated (the same seed gives the same corpus).
+    :return: A list of (name, clause set) tuples.
+    """
+
+    if directory is not None:
+        return [(name, load_dimacs(os.path.join(directory, name)))
+                for name in sorted(os.listdir(directory))
+                if os.path.isfile(os.path.join(directory, name))]
+
+    corpus = list()
+    for num_vars in (20, 50, 75, 100):
+        for i in range(1, 3):
+            corpus.append((f'uf{num_vars}-{i:02d}',
+                           random_ksat(num_vars, round(4.26 * num_vars),
+                                       seed=seed * 1000 + num_vars * 10 + i)))
+    for holes in (4, 5, 6):
+        corpus.append((f'hole{holes}', pigeonhole(holes)))
+    return corpus
+
+
+# solver variants compared by run_benchmarks. Each is a run_engine config, except that solvers
+# which are exponential in the number of variables are skipped on instances with over 'max_vars'
+BENCHMARK_CONFIGS = {
+    'simple': {'engine': 'simple', 'bit_parallel': True, 'max_vars': 20},
+    'branching': {'engine': 'branching', 'max_vars': 20},
+    'dpll': {'engine': 'dpll'},
+    'dpll_vsids': {'engine': 'dpll', 'heuristic': 'vsids'},
+    'cdcl': {'engine': 'cdcl'},
+    'cdcl_luby': {'engine': 'cdcl', 'restart_policy': 'luby'},
+    'local_search': {'engine': 'local_search', 'max_flips': 10 ** 5, 'seed': 0},
+}
+
+
+def run_benchmarks(corpus: Optional[List[Tuple[str, List[List[int]]]]] = None,
+                   configs: Optional[Dict[str, Dict]] = None, repeats: int = 5, warmup: int = 1,
+                   results_path: Optional[str] = None, baseline_path: Optional[str] = None,
+                   tolerance: float = 1.25, min_difference: float = 0.005,
+                   verbose: bool = False) -> List[Dict]:
+    """
+    Times every solver config on every instance of corpus, repeating each solve so that the median
+    and 95th percentile times are not thrown off by a single slow run.
+
+    Every returned model is verified and, since a verified model proves an instance is SAT, any
+    solver claiming that instance is UNSAT is reported as INVALID (as is an invalid model).
+    If a baseline (a previous results file) is given, solves whose median time has grown by more
+    than tolerance times (and by at least min_difference seconds, to ignore noise on very quick
+    solves) are flagged as regressions.
+
+    e.g. ``run_benchmarks(results_path='results.json')`` and then, after changing a solver,
+    ``run_benchmarks(baseline_path='results.json', verbose=True)`` prints any regressions
+
+    :param corpus: List of (name, clause set) tuples. Defaults to benchmark_corpus().
+    :param configs: Dict of name -> run_engine config (see BENCHMARK_CONFIGS, the default).
+    :param repeats: Number of timed solves of each instance by each solver.
+    :param warmup: Number of untimed solves to do first (e.g. to fill caches).
+    :param results_path: If given, the results are written to it as JSON.
+    :param baseline_path: If given (and it exists), a results file to compare times against.
+    :param tolerance: Factor by which a median time must exceed the baseline to be a regression.
+    :param min_difference: Number of seconds by which it must also exceed the baseline.
+    :param verbose: If True, prints each result as it is found.
+    :return: A dict for each instance and solver with its 'instance' and 'solver' names, 'status'
+        ('SAT', 'UNSAT', 'UNKNOWN' or 'INVALID'), 'median' and 'p95' times, every timed run in
+        'times' (all in seconds), 'stats' from the last solve (see SolverStats - None if the
+        solver does not collect them), the 'baseline' median (None if there is none) and whether
+        it is a 'regression'.
+    """
+
+    if repeats < 1:
+        raise ValueError('At least one timed repeat is needed.')
+    corpus = benchmark_corpus() if corpus is None else corpus
+    configs = BENCHMARK_CONFIGS if configs is None else configs
+
+    baseline = dict()
+    if baseline_path is not None and os.path.exists(baseline_path):
+        with open(baseline_path) as fobj:
+            baseline = {(row['instance'], row['solver']): row['median'] for row in json.load(fobj)}
+
+    results = list()
+    for name, clause_set in corpus:
+        num_vars = max((abs(literal) for clause in clause_set for literal in clause), default=0)
+        rows = list()
+        for solver, config in configs.items():
+            options = dict(config)
+            max_vars = options.pop('max_vars', None)
+            if max_vars is not None and num_vars > max_vars:
+                continue
+            collects_stats = options.get('engine', 'cdcl') in ('cdcl', 'dpll')
+
+            times = list()
+            for run in range(warmup + repeats):
+                stats = SolverStats()
+                if collects_stats:
+                    options['stats'] = stats
+                start = time.perf_counter()
+                result = run_engine(clause_set, options)
+                if run >= warmup:
+                    times.append(time.perf_counter() - start)
+
+            if result is None:
+                status = 'UNKNOWN'
+            elif result is False:
+                status = 'UNSAT'
+            else:
+                status = 'SAT' if verify_assignment(clause_set, result) else 'INVALID'
+            times.sort()
+            rows.append({'instance': name, 'solver': solver, 'status': status,
+                         'median': times[len(times) // 2] if len(times) % 2 else
+                         (times[len(times) // 2 - 1] + times[len(times) // 2]) / 2,
+                         'p95': times[min(len(times) - 1, -(-95 * len(times) // 100) - 1)],
+                         'times': times, 'stats': stats.to_dict() if collects_stats else None,
+                         'baseline': baseline.get((name, solver))})
+
+        is_sat = any(row['status'] == 'SAT' for row in rows)
+        for row in rows:
+            if is_sat and row['status'] == 'UNSAT':
+                row['status'] = 'INVALID'
+            row['regression'] = (row['baseline'] is not None and
+                                 row['median'] > row['baseline'] * tolerance and
+                                 row['median'] - row['baseline'] >= min_difference)
+            if verbose:
+                print(f"{name:20} {row['solver']:14} {row['status']:8} "
+                      f"median {row['median']:.4f}s p95 {row['p95']:.4f}s"
+                      + (f" REGRESSION (baseline {row['baseline']:.4f}s)"
+                         if row['regression'] else ''))
+        results.extend(rows)
+
+    if results_path is not None:
+        with open(results_path, 'w') as fobj:
+            json.dump(results, fobj, indent=1)
+    return results
+
+
+# === COMMAND LINE ===
+def main(argv: Optional[List[str]] = None):
+    """
+    Solves DIMACS files given on the command line (or one path per line of stdin if there are none)
+    with solve_many, printing each result as a line of JSON as soon as it is found.
+
+    e.g. ``python "SAT Solving Coursework Feb 2022 (CT).py" --timeout 10 uf50-01.cnf hole6.cnf``
+    """
+
+    parser = argparse.ArgumentParser(description='Solves DIMACS CNF files in a pool of worker '
+                                                 'processes, printing a JSON line for each.')
+    parser.add_argument('paths', nargs='*',
+                        help='DIMACS files to solve (read from stdin, one per line, if none)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('--timeout', type=float, default=None, help='seconds allowed per file')
+    parser.add_argument('--max-conflicts', type=int, default=None,
+                        help='conflicts allowed per file')
+    parser.add_argument('--engine', choices=ENGINES, default='cdcl', help='solver to use')
+    parser.add_argument('--cache', default=None,
+                        help='SQLite database of previous results to reuse and add to')
+    args = parser.parse_args(argv)
+
+    paths = args.paths or (line.strip() for line in sys.stdin if line.strip())
+    for result in solve_many(paths, args.workers, args.timeout, args.max_conflicts,
+                             {'engine': args.engine}, args.cache):
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == '__main__':
+    main()
+
+
+# === OWN TESTING ===
+# if __name__ == '__main__':
+#     # print(simple_sat_solve([]))
+#
+#     def test_file(path, n=10, average=True):
+#         print(f'###TESTING {path}###')
+#         test_clause_set = load_dimacs(path)
+#         # print(test_clause_set)
+#         start = time.time()
+#         dpll_output = dpll_sat_solve(test_clause_set, [], use_max_heuristic=True)
+#         print(time.time() - start, dpll_output)
+#         if dpll_output is not False:  # could be [] which is valid
+#             if not check_sat_assignment(load_dimacs(path), dpll_output):
+#                 print('OUTPUT INVALID')
+#
+#         if average:
+#             print(' - Average time tests:')
+#             total = 0
+#             for _ in trange(n):
+#                 test_clause_set = load_dimacs(path)
+#                 start = time.time()
+#                 dpll_sat_solve(test_clause_set, [], use_max_heuristic=True)
+#                 total += time.time() - start
+#
+#             print(f'Averaged over {n} tests: {total/n}s')
+#
+#
+#     # test_file('Sample SAT tests/W_2,3_ n=8 (SAT).txt')
+#     test_file('Sample SAT tests/8queens (SAT).txt', average=True)
+#     test_file('Sample SAT tests/hole6 (UNSAT).txt')
+#     # test_file('Sample SAT tests/uf50-01.cnf', average=False)
+#     # test_file('Sample SAT tests/uuf50-01.cnf', average=False)
+#     test_file('Sample SAT tests/uf100-01.cnf', average=True)
+#     # test_file('Sample SAT tests/uuf100-01.cnf', average=True)
+#     test_file('Sample SAT tests/uf150-01.cnf', average=False)
+#     # test_file('Sample SAT tests/uuf150-01.cnf', average=False)
+#
+#     # start = time.time()
+#     # print(simple_sat_solve(test_clause_set, print_all=True), 'simple', time.time() - start)
+#     # start = time.time()
+#     # print(branching_sat_solve(test_clause_set, []), 'branching', time.time() - start)
+#
+#     # Practical Exercises Wk14 Q7.3:
+#     practical_ex = [[1, 2, 3], [1, -2, -4], [2, -3, 4], [-1, 3, 4], [-1, 2, -4],
+#                     [1, -2, -3], [-1, -2, 4], [-1, -3, -4]]
+#     print(simple_sat_solve(practical_ex))
+#     print(branching_sat_solve(practical_ex, []))
+#     print(dpll_sat_solve(practical_ex, []))